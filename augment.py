@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def augment_numpy(landmarks, seed=None, rotation=15.0, scale=0.1, translation=0.05, depth=0.01, mirror=0.5):
+    """
+    Randomly rotate, scale, shift, mirror and depth-jitter a batch of hands.
+
+    landmarks is (n, 21, 3) or (n, 21, 3, 1) in MediaPipe's normalized
+    coordinates, landmark 0 being the wrist; the result has the same shape.
+    Each sample draws its own parameters, all in whole-array operations:
+        rotation     max in-plane rotation about the wrist, degrees
+        scale        max relative size change about the wrist
+        translation  max x / y shift, in normalized image units
+        depth        standard deviation of per-landmark z noise
+        mirror       probability of a left/right flip about the wrist
+    seed is an int or a np.random.Generator; the same seed gives the same
+    result.
+    """
+    rng = np.random.default_rng(seed)
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    points = landmarks.reshape((len(landmarks), 21, 3))
+    n = len(points)
+
+    angles = np.radians(rng.uniform(-rotation, rotation, (n, 1))).astype(np.float32)
+    factors = rng.uniform(1.0 - scale, 1.0 + scale, (n, 1)).astype(np.float32)
+    flips = np.where(rng.random((n, 1)) < mirror, np.float32(-1.0), np.float32(1.0))
+    shifts = rng.uniform(-translation, translation, (n, 2)).astype(np.float32)
+    noise = rng.normal(0.0, depth, (n, 21)).astype(np.float32)
+    return _apply(points, np.cos(angles), np.sin(angles), factors, flips, shifts, noise, np).reshape(landmarks.shape)
+
+
+def augment_tf(landmarks, seed, rotation=15.0, scale=0.1, translation=0.05, depth=0.01, mirror=0.5):
+    """
+    augment_numpy as TensorFlow ops, for use inside tf.data / tf.function.
+    seed is a shape (2,) integer tensor; the stateless random ops make the
+    result depend on it alone.
+    """
+    import tensorflow as tf
+
+    landmarks = tf.convert_to_tensor(landmarks, tf.float32)
+    points = tf.reshape(landmarks, [-1, 21, 3])
+    n = tf.shape(points)[0]
+    seeds = tf.random.experimental.stateless_split(seed, 5)
+
+    angles = tf.random.stateless_uniform([n, 1], seeds[0], -rotation, rotation) * (np.pi / 180.0)
+    factors = tf.random.stateless_uniform([n, 1], seeds[1], 1.0 - scale, 1.0 + scale)
+    flips = tf.where(tf.random.stateless_uniform([n, 1], seeds[2]) < mirror, -1.0, 1.0)
+    shifts = tf.random.stateless_uniform([n, 2], seeds[3], -translation, translation)
+    noise = tf.random.stateless_normal([n, 21], seeds[4], stddev=depth)
+    return tf.reshape(_apply(points, tf.cos(angles), tf.sin(angles), factors, flips, shifts, noise, tf),
+                      tf.shape(landmarks))
+
+
+def _apply(points, cos, sin, factors, flips, shifts, noise, xp):
+    """
+    The transform shared by both backends; xp is numpy or tensorflow.
+    Per-sample parameters are (n, 1) columns (shifts (n, 2), noise (n, 21)).
+    """
+    wrist_x, wrist_y = points[:, :1, 0], points[:, :1, 1]
+    x = (points[:, :, 0] - wrist_x) * flips
+    y = points[:, :, 1] - wrist_y
+    new_x = (cos * x - sin * y) * factors + wrist_x + shifts[:, :1]
+    new_y = (sin * x + cos * y) * factors + wrist_y + shifts[:, 1:]
+    new_z = points[:, :, 2] * factors + noise
+    return xp.stack([new_x, new_y, new_z], axis=-1)
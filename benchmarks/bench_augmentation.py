@@ -0,0 +1,63 @@
+"""
+Landmark augmentation throughput: augmenting one sample at a time in a
+Python loop vs augment.augment_numpy and augment.augment_tf on whole batches.
+
+The per-sample loop applies the same transform through augment_numpy with
+a batch of one, so the gap is the per-call overhead the vectorized path
+avoids. The batch is the store's samples tiled to --samples.
+
+Run from the repository root:
+    python -m benchmarks.bench_augmentation --samples 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from augment import augment_numpy, augment_tf
+from landmark_store import LandmarkStore
+
+
+def per_sample(landmarks, seed):
+    rng = np.random.default_rng(seed)
+    return np.stack([augment_numpy(sample[None], rng)[0] for sample in landmarks])
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--samples', type=int, default=100000)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    features = np.array(LandmarkStore(args.store).features)
+    batch = features[np.arange(args.samples) % len(features)]
+    augment_graph = tf.function(augment_tf)
+    seed = tf.constant([0, 0])
+    augment_graph(batch, seed)
+
+    # The loop is slow, so it is timed on a slice and scaled
+    loop_samples = min(args.samples, 5000)
+    results = (
+        ('per-sample loop', best_of(lambda: per_sample(batch[:loop_samples], 0), 1) * args.samples / loop_samples),
+        ('augment_numpy', best_of(lambda: augment_numpy(batch, 0))),
+        ('augment_tf', best_of(lambda: augment_graph(batch, seed).numpy())),
+    )
+    print(f"{args.samples} samples\n")
+    print(f"{'method':<18}{'ms':>10}{'M landmarks/s':>16}")
+    for name, seconds in results:
+        print(f"{name:<18}{seconds * 1e3:>10.1f}{args.samples * 21 / seconds / 1e6:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of saving a sample inside the capture loop: the notebook's
+np.save-per-file collection vs collect.SampleWriter appending to a
+LandmarkStore from a background thread.
+
+Each sample is timed from the capture loop's point of view (how long the
+loop is blocked before it can read the next frame), then the time until
+every sample is on disk. At 30 fps the loop has 33 ms per frame in total,
+hand tracking included. The writer fsyncs every batch while np.save does
+not, so its total includes making the samples durable.
+
+Run from the repository root:
+    python -m benchmarks.bench_collection_writer --samples 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from collect import SampleWriter
+from landmark_store import LandmarkStore
+
+
+def save_per_file(folder, samples, labels):
+    """
+    The saving step from datacollection.ipynb, one file per sample.
+    """
+    blocked = []
+    for i, (landmarks, label) in enumerate(zip(samples, labels)):
+        start = time.perf_counter()
+        np.save(os.path.join(folder, f"{label}_{i}.npy"), landmarks.flatten())
+        blocked.append(time.perf_counter() - start)
+    return blocked
+
+
+def save_writer(path, samples, labels, batch_size):
+    blocked = []
+    with SampleWriter(LandmarkStore.create(path), batch_size=batch_size) as writer:
+        for landmarks, label in zip(samples, labels):
+            start = time.perf_counter()
+            writer.put(landmarks, label)
+            blocked.append(time.perf_counter() - start)
+    return blocked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = rng.random((args.samples, 1, 21, 3, 1)).astype(np.float32)
+    labels = [['hello', 'yes', 'no'][i % 3] for i in range(args.samples)]
+
+    print(f"{args.samples} samples\n")
+    print(f"{'writer':<24}{'blocked p50 ms':>16}{'blocked p99 ms':>16}{'total s':>10}{'files':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, 'samples')
+        os.makedirs(folder)
+        store = os.path.join(tmp, 'store')
+        for name, target, save in (
+            ('np.save per sample', folder, lambda: save_per_file(folder, samples, labels)),
+            (f"SampleWriter ({args.batch_size}/batch)", store,
+             lambda: save_writer(store, samples, labels, args.batch_size)),
+        ):
+            start = time.perf_counter()
+            blocked = np.array(save())
+            total = time.perf_counter() - start
+            print(f"{name:<24}{np.percentile(blocked, 50) * 1e3:>16.3f}{np.percentile(blocked, 99) * 1e3:>16.3f}"
+                  f"{total:>10.2f}{len(os.listdir(target)):>8}")
+        assert len(LandmarkStore(store)) == args.samples
+
+
+if __name__ == '__main__':
+    main()
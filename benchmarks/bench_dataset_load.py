@@ -0,0 +1,92 @@
+"""
+Training-set load time: the notebook's one-np.load-per-file loop over
+<label>_<n>.npy samples vs opening a packed LandmarkStore.
+
+--samples builds a larger synthetic dataset (jittered copies of the real
+samples) in a temporary directory, in both layouts, to show how each scales.
+Both paths end with the same (n, 21, 3, 1) float32 features and label array
+in memory; files are read from the warm page cache in both cases.
+
+Run from the repository root:
+    python -m benchmarks.bench_dataset_load --folder sign_language_data1 --samples 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from landmark_store import LandmarkStore, convert_npy_directory, read_npy_directory
+
+
+def load_per_file(folder):
+    """
+    The loading loop from datacollection.ipynb.
+    """
+    data, labels = [], []
+    for file in os.listdir(folder):
+        if file.endswith(".npy"):
+            label = file.split("_")[0]
+            landmarks = np.load(os.path.join(folder, file))
+            data.append(landmarks)
+            labels.append(label)
+    return np.array(data).reshape((-1, 21, 3, 1)), np.array(labels)
+
+
+def load_store(path):
+    features, labels = LandmarkStore(path).to_arrays()
+    # Copy out of the memory map so both loaders end with the data in RAM
+    return np.array(features), labels
+
+
+def write_synthetic(folder, features, labels, samples, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder)
+    counters = {}
+    for i in range(samples):
+        j = i % len(features)
+        sample = features[j] + rng.normal(0, 0.002, features[j].shape)
+        counters[labels[j]] = counters.get(labels[j], -1) + 1
+        np.save(os.path.join(folder, f"{labels[j]}_{counters[labels[j]]}.npy"), sample)
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folder', default='sign_language_data1')
+    parser.add_argument('--samples', type=int, default=0, help='synthetic dataset size (0: the folder as is)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if args.samples:
+            features, labels = read_npy_directory(args.folder)
+            folder = os.path.join(tmp, 'samples')
+            write_synthetic(folder, features, labels, args.samples)
+        start = time.perf_counter()
+        convert_npy_directory(folder, os.path.join(tmp, 'store'))
+        convert_seconds = time.perf_counter() - start
+
+        file_seconds, (file_x, file_y) = timed(load_per_file, folder)
+        store_seconds, (store_x, store_y) = timed(load_store, os.path.join(tmp, 'store'))
+
+    assert file_x.shape == store_x.shape
+    assert sorted(file_y) == sorted(store_y)
+    print(f"{len(store_x)} samples, one-off conversion {convert_seconds:.2f} s\n")
+    print(f"{'loader':<14}{'seconds':>10}{'files opened':>14}")
+    print(f"{'per-file .npy':<14}{file_seconds:>10.4f}{len(file_x):>14}")
+    print(f"{'LandmarkStore':<14}{store_seconds:>10.4f}{3:>14}")
+    print(f"\n{file_seconds / store_seconds:.0f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark: Keras model.predict vs GesturePredictor on a single frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_inference --iterations 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+from inference import MODEL_PATH, LANDMARK_SHAPE, load_predictor
+
+
+def time_calls(fn, sample, iterations):
+    """
+    Call fn(sample) repeatedly and return per-call latencies in microseconds.
+    """
+    latencies = np.empty(iterations, dtype=np.float64)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(sample)
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.model)
+    model = predictor.model
+    sample = np.random.default_rng(0).random((1,) + LANDMARK_SHAPE, dtype=np.float32)
+
+    # Same call the live loops used before the predictor existed
+    model.predict(sample, verbose=0)
+
+    np.testing.assert_allclose(
+        predictor.predict(sample), model.predict(sample, verbose=0), rtol=1e-5, atol=1e-6
+    )
+
+    results = {
+        'model.predict': time_calls(lambda x: model.predict(x, verbose=0), sample, args.iterations),
+        'GesturePredictor.predict': time_calls(predictor.predict, sample, args.iterations),
+    }
+
+    print(f"{'method':<28}{'mean us':>12}{'p50 us':>12}{'p95 us':>12}")
+    for name, lat in results.items():
+        print(f"{name:<28}{lat.mean():>12.1f}{np.percentile(lat, 50):>12.1f}{np.percentile(lat, 95):>12.1f}")
+
+    speedup = np.median(results['model.predict']) / np.median(results['GesturePredictor.predict'])
+    print(f"\nMedian speedup: {speedup:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
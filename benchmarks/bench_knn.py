@@ -0,0 +1,110 @@
+"""
+Nearest-neighbour backend vs the gesture CNN as the index grows.
+
+The CNN is trained with train.train on the training split and run on the
+NumPy backend. The k-NN index is built from the same training split, then
+grown to each --sizes entry with augment_numpy copies of it (rotation,
+scale, shift, mirroring, depth noise), as collecting more samples would.
+Per index size it reports build time, pickled size and load time, test
+accuracy (top-1 and top-3), and the per-frame latency of one (1, 21, 3, 1)
+query, feature computation included, through the cKDTree and through a
+brute-force NumPy scan of the same features for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_knn --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from augment import augment_numpy
+from features import canonical_features
+from inference import LANDMARK_SHAPE, load_predictor
+from knn_model import KNNGestureModel
+from train import train
+from training_data import load_splits
+
+
+def latency_us(predict, sample, iterations):
+    predict(sample)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        predict(sample)
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies) * 1e6
+
+
+def grow(landmarks, class_ids, size, seed):
+    """
+    The training hands followed by augmented copies of them, size samples in total.
+    """
+    indices = np.arange(size) % len(landmarks)
+    grown = landmarks[indices]
+    grown[len(landmarks):] = augment_numpy(grown[len(landmarks):], seed=seed)
+    return grown, class_ids[indices]
+
+
+def brute_force(features, k):
+    def predict(landmarks):
+        query = canonical_features(landmarks)
+        distances = np.einsum('ij,ij->i', features, features) - 2 * features @ query[0]
+        return np.argpartition(distances, k)[:k]
+
+    return predict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    splits, class_names = load_splits(args.store, seed=args.seed)
+    train_x, train_y = splits['train']
+    test_x, test_y = splits['test']
+    test_x = test_x.reshape((-1,) + LANDMARK_SHAPE)
+    sample = test_x[:1]
+
+    print(f"{len(train_y)} training and {len(test_y)} held-out samples, k={args.k}\n")
+    print(f"{'model':<14}{'build ms':>9}{'size MB':>9}{'load ms':>9}{'top-1':>8}{'top-3':>8}{'tree us':>9}{'brute us':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        model, _, _, _ = train(args.store, args.epochs, seed=args.seed, verbose=0)
+        path = os.path.join(tmp, 'cnn.h5')
+        model.save(path)
+        cnn = load_predictor(path, backend='numpy')
+        scores = cnn.predict(test_x)
+        top3 = (np.argsort(scores, axis=1)[:, -3:] == test_y[:, None]).any(axis=1).mean()
+        print(f"{'cnn (numpy)':<14}{'-':>9}{os.path.getsize(path) / 2 ** 20:>9.2f}{'-':>9}"
+              f"{(scores.argmax(axis=1) == test_y).mean():>8.1%}{top3:>8.1%}"
+              f"{latency_us(cnn.predict, sample, args.iterations):>9.1f}{'-':>10}")
+
+        for size in [len(train_y)] + [size for size in args.sizes if size > len(train_y)]:
+            landmarks, class_ids = grow(train_x, train_y, size, args.seed)
+            start = time.perf_counter()
+            features = canonical_features(landmarks)
+            knn = KNNGestureModel(features, class_ids, class_names, k=args.k)
+            build_ms = (time.perf_counter() - start) * 1e3
+            path = os.path.join(tmp, f"{size}.knn.pkl")
+            knn.save(path)
+            start = time.perf_counter()
+            knn = KNNGestureModel.load(path)
+            load_ms = (time.perf_counter() - start) * 1e3
+
+            scores = knn.predict(test_x)
+            top3 = (np.argsort(scores, axis=1)[:, -3:] == test_y[:, None]).any(axis=1).mean()
+            print(f"{f'knn {size}':<14}{build_ms:>9.1f}{os.path.getsize(path) / 2 ** 20:>9.2f}{load_ms:>9.1f}"
+                  f"{(scores.argmax(axis=1) == test_y).mean():>8.1%}{top3:>8.1%}"
+                  f"{latency_us(knn.predict, sample, args.iterations):>9.1f}"
+                  f"{latency_us(brute_force(features, args.k), sample, args.iterations // 10):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
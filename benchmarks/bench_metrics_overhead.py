@@ -0,0 +1,49 @@
+"""
+Cost of the live-loop instrumentation (metrics.LoopMetrics) per timed stage.
+
+Times an empty `with metrics.timer(...)` block with metrics disabled and
+enabled, and the same loop with no timer at all. The live loop times about
+ten stages per frame, so multiply by ten for the per-frame cost.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics_overhead
+"""
+import argparse
+import time
+
+from metrics import LoopMetrics
+
+
+def per_call_ns(fn, iterations):
+    start = time.perf_counter()
+    fn(iterations)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def bare(iterations):
+    for _ in range(iterations):
+        pass
+
+
+def timed(metrics):
+    def run(iterations):
+        for _ in range(iterations):
+            with metrics.timer('stage'):
+                pass
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    baseline = per_call_ns(bare, args.iterations)
+    print(f"{'metrics':<10}{'ns per stage':>14}{'us per frame (10 stages)':>26}")
+    for name, metrics in (('disabled', LoopMetrics(enabled=False)), ('enabled', LoopMetrics(enabled=True))):
+        overhead = per_call_ns(timed(metrics), args.iterations) - baseline
+        print(f"{name:<10}{overhead:>14.0f}{overhead * 10 / 1e3:>26.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Gesture CNN on raw coordinates vs the MLP on canonical features.
+
+Both models are trained from scratch with train.train on the same seeded
+split, then compared on:
+  - test accuracy;
+  - test accuracy with every test hand moved and shrunk (shifted 0.15 in x
+    and y, scaled 0.8 about the wrist), i.e. the same poses somewhere else in
+    the frame;
+  - per-frame latency of a single (1, 21, 3, 1) sample, feature computation
+    included, for both inference backends.
+
+Run from the repository root:
+    python -m benchmarks.bench_model_tiers --epochs 100
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from inference import LANDMARK_SHAPE, load_predictor
+from train import train
+from training_data import load_splits
+
+
+def move_hands(features, shift=0.15, scale=0.8):
+    wrist = features[:, :1]
+    moved = wrist + (features - wrist) * scale
+    moved[:, :, :2] += shift
+    return moved
+
+
+def latency_us(predictor, sample, iterations):
+    predictor.predict(sample)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        predictor.predict(sample)
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    splits, _ = load_splits(args.store)
+    test_x, test_y = splits['test']
+    test_x = test_x.reshape((-1,) + LANDMARK_SHAPE)
+    moved_x = move_hands(splits['test'][0]).reshape((-1,) + LANDMARK_SHAPE)
+
+    print(f"{'model':<6}{'params':>9}{'test acc':>10}{'moved acc':>11}{'keras us':>10}{'numpy us':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for model_type in ('cnn', 'mlp'):
+            model, _, _, _ = train(args.store, args.epochs, verbose=0, model_type=model_type)
+            path = os.path.join(tmp, f"{model_type}.h5")
+            model.save(path)
+            predictors = {backend: load_predictor(path, backend=backend) for backend in ('keras', 'numpy')}
+            accuracy = (predictors['numpy'].predict(test_x).argmax(axis=1) == test_y).mean()
+            moved_accuracy = (predictors['numpy'].predict(moved_x).argmax(axis=1) == test_y).mean()
+            latencies = [latency_us(predictors[backend], test_x[:1], args.iterations) for backend in ('keras', 'numpy')]
+            print(f"{model_type:<6}{model.count_params():>9}{accuracy:>10.1%}{moved_accuracy:>11.1%}"
+                  f"{latencies[0]:>10.1f}{latencies[1]:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+How much classification work the MotionGate saves on recorded footage.
+
+Landmarks are extracted once from the video; the classify step (predict +
+decode) is then replayed through MotionGate at the video's frame rate for a
+range of epsilons. Reports the hit rate, model time per hand frame and how
+often the gated label differs from classifying every frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_motion_gate --video Imagine_a_world_where_V1.mp4 --backend numpy
+"""
+import argparse
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from benchmarks.bench_preprocess import read_frames
+from frame_processing import HANDS_CONFIG, FrameProcessor
+from inference import load_predictor
+from prediction_state import MotionGate
+
+
+def extract_landmarks(frames):
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        processor = FrameProcessor(hands)
+        landmarks = []
+        for frame in frames:
+            result, _ = processor.process(frame)
+            landmarks.append(None if result is None else result.copy())
+    return landmarks
+
+
+def replay(landmarks, classify, epsilon, max_age, fps):
+    frame_time = [0.0]
+    gate = MotionGate(epsilon=epsilon, max_age=max_age, clock=lambda: frame_time[0])
+    labels = []
+    start = time.perf_counter()
+    for i, result in enumerate(landmarks):
+        frame_time[0] = i / fps
+        if result is None:
+            gate.reset()
+            continue
+        labels.append(gate(result, classify))
+    return gate, labels, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--backend', default='keras', choices=['keras', 'numpy'])
+    parser.add_argument('--epsilons', default='0,0.002,0.004,0.008,0.016')
+    parser.add_argument('--max-age', type=float, default=0.5)
+    args = parser.parse_args()
+
+    fps = cv2.VideoCapture(args.video).get(cv2.CAP_PROP_FPS) or 30.0
+    landmarks = extract_landmarks(read_frames(args.video, args.frames))
+    hand_frames = sum(result is not None for result in landmarks)
+    print(f"{len(landmarks)} frames at {fps:.0f} fps, {hand_frames} with a hand\n")
+
+    predictor = load_predictor(backend=args.backend)
+
+    def classify(result):
+        prediction = predictor.predict(result)
+        index = int(np.argmax(prediction[0]))
+        return index, float(prediction[0][index])
+
+    _, reference, _ = replay(landmarks, classify, 0, args.max_age, fps)
+
+    print(f"{'epsilon':>9}{'hit rate':>10}{'model calls':>13}{'ms/frame':>10}{'label diff':>12}")
+    for epsilon in map(float, args.epsilons.split(',')):
+        gate, labels, seconds = replay(landmarks, classify, epsilon, args.max_age, fps)
+        differ = np.mean([a[0] != b[0] for a, b in zip(labels, reference)])
+        print(
+            f"{epsilon:>9g}{gate.hit_rate:>10.1%}{gate.misses:>13}"
+            f"{seconds / hand_frames * 1e3:>10.3f}{differ:>12.1%}"
+        )
+
+
+if __name__ == '__main__':
+    main()
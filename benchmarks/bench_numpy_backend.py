@@ -0,0 +1,76 @@
+"""
+Check the NumPy backend against Keras and compare startup, memory and latency.
+
+Run from the repository root:
+    python -m benchmarks.bench_numpy_backend --data sign_language_data1
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from inference import MODEL_PATH, LANDMARK_SHAPE, load_predictor
+
+# VmHWM is the peak RSS of the child's own address space (Linux only)
+LOAD_SNIPPET = (
+    "import sys, time; t = time.perf_counter(); "
+    "from inference import load_predictor; p = load_predictor(sys.argv[1], backend=sys.argv[2]); "
+    "hwm = [l.split()[1] for l in open('/proc/self/status') if l.startswith('VmHWM')][0]; "
+    "print(time.perf_counter() - t, hwm, 'tensorflow' in sys.modules)"
+)
+
+
+def load_samples(data_folder):
+    files = sorted(glob.glob(os.path.join(data_folder, '*.npy')))
+    return np.stack([np.load(f) for f in files]).astype(np.float32).reshape((-1,) + LANDMARK_SHAPE)
+
+
+def cold_start(model_path, backend):
+    """
+    Load the backend in a fresh interpreter; return (seconds, max RSS in MB, imported TF).
+    """
+    out = subprocess.run(
+        [sys.executable, '-c', LOAD_SNIPPET, model_path, backend],
+        check=True, capture_output=True, text=True, cwd=os.getcwd(),
+    ).stdout.split()
+    return float(out[0]), int(out[1]) / 1024, out[2] == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--data', default='sign_language_data1')
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--atol', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    samples = load_samples(args.data)
+    keras_predictor = load_predictor(args.model, backend='keras')
+    numpy_predictor = load_predictor(args.model, backend='numpy')
+
+    expected = keras_predictor.predict(samples)
+    actual = numpy_predictor.predict(samples)
+    max_error = np.abs(expected - actual).max()
+    agreement = (expected.argmax(axis=1) == actual.argmax(axis=1)).mean()
+    print(f"{len(samples)} samples: max |keras - numpy| = {max_error:.2e}, argmax agreement = {agreement:.2%}")
+    if max_error > args.atol:
+        sys.exit(f"NumPy backend differs from Keras by more than {args.atol}")
+
+    print(f"\n{'backend':<10}{'p50 us/frame':>14}{'cold start s':>14}{'max RSS MB':>12}{'imports TF':>12}")
+    for name, predictor in (('numpy', numpy_predictor), ('keras', keras_predictor)):
+        sample = samples[:1]
+        latencies = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            predictor.predict(sample)
+            latencies.append(time.perf_counter() - start)
+        seconds, rss_mb, imports_tf = cold_start(args.model, name)
+        print(f"{name:<10}{np.median(latencies) * 1e6:>14.1f}{seconds:>14.2f}{rss_mb:>12.0f}{str(imports_tf):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Prediction box updates per second on recorded footage: one message per
+frame (the old loop) vs change-only updates with temporal smoothing.
+
+Landmarks are extracted once from the video and classified per frame; the
+probability vectors are then replayed at the video's frame rate through
+PredictionSmoother and PredictionDisplay exactly as the live loop does.
+Reports browser messages per second and label changes per second.
+
+Run from the repository root:
+    python -m benchmarks.bench_prediction_display --video Imagine_a_world_where_V1.mp4 --backend numpy
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_motion_gate import extract_landmarks
+from benchmarks.bench_preprocess import read_frames
+from inference import load_predictor
+from prediction_state import PredictionDisplay, PredictionSmoother
+
+
+def replay(probabilities, fps, smoother=None, confidence_step=None):
+    """
+    Returns (messages, label changes) for one pass over the clip.
+    """
+    frame_time = [0.0]
+    display = PredictionDisplay(confidence_step=confidence_step or 1.0, clock=lambda: frame_time[0])
+    messages = changes = 0
+    label = ()
+    for i, frame_probabilities in enumerate(probabilities):
+        frame_time[0] = i / fps
+        if frame_probabilities is None:
+            if smoother is not None:
+                smoother.reset()
+            current, confidence = None, None
+        elif smoother is not None:
+            current, confidence = smoother.update(frame_probabilities)
+        else:
+            current = int(np.argmax(frame_probabilities))
+            confidence = float(frame_probabilities[current])
+
+        changes += current != label
+        label = current
+        if confidence_step is None:
+            messages += 1
+        else:
+            messages += display.should_update(current, confidence)
+    return messages, changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--backend', default='keras', choices=['keras', 'numpy'])
+    parser.add_argument('--window', type=int, default=8)
+    parser.add_argument('--alpha', type=float, default=0.3)
+    parser.add_argument('--confidence-step', type=float, default=0.05)
+    args = parser.parse_args()
+
+    fps = cv2.VideoCapture(args.video).get(cv2.CAP_PROP_FPS) or 30.0
+    landmarks = extract_landmarks(read_frames(args.video, args.frames))
+    predictor = load_predictor(backend=args.backend)
+    probabilities = [None if result is None else predictor.predict(result)[0] for result in landmarks]
+    seconds = len(probabilities) / fps
+    print(f"{len(probabilities)} frames ({seconds:.1f} s at {fps:.0f} fps)\n")
+
+    runs = [
+        ('every frame', None, None),
+        ('change-only, raw', None, args.confidence_step),
+        ('change-only, majority', PredictionSmoother(args.window, 'majority'), args.confidence_step),
+        ('change-only, ema', PredictionSmoother(args.window, 'ema', args.alpha), args.confidence_step),
+    ]
+    print(f"{'mode':<24}{'msg/s':>8}{'label changes/s':>18}")
+    for name, smoother, step in runs:
+        messages, changes = replay(probabilities, fps, smoother, step)
+        print(f"{name:<24}{messages / seconds:>8.2f}{changes / seconds:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the original preprocess_frame with FrameProcessor on recorded footage.
+
+Reports per-frame time and per-frame allocations (count of new memory blocks
+and bytes, measured with tracemalloc) for both paths, including the RGB
+conversion the display needs.
+
+Run from the repository root:
+    python -m benchmarks.bench_preprocess --video Imagine_a_world_where_V1.mp4
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from frame_processing import HANDS_CONFIG, FrameProcessor
+
+
+def legacy_preprocess(hands, frame):
+    """
+    Verbatim copy of the list-building preprocess_frame, plus the caller's
+    second BGR->RGB conversion for display.
+    """
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    results = hands.process(frame_rgb)
+    landmarks_array = None
+    if results.multi_hand_landmarks:
+        hand_landmarks = results.multi_hand_landmarks[0]
+        landmarks_array = []
+        for landmark in hand_landmarks.landmark:
+            landmarks_array.extend([landmark.x, landmark.y, landmark.z])
+        landmarks_array = np.array(landmarks_array, dtype=np.float32)
+        landmarks_array = landmarks_array.reshape(1, 21, 3, 1)
+    display = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return landmarks_array, display
+
+
+def processor_preprocess(processor, frame):
+    landmarks, _ = processor.process(frame)
+    return landmarks, processor.rgb
+
+
+def read_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def count_new_blocks(before, after):
+    """
+    Number of memory blocks allocated between two snapshots (frees excluded).
+    """
+    return sum(stat.count_diff for stat in after.compare_to(before, 'traceback') if stat.count_diff > 0)
+
+
+def run(name, fn, frames):
+    # Warm-up pass: MediaPipe graph start-up and buffer allocation
+    for frame in frames[:10]:
+        fn(frame)
+
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        fn(frame)
+        latencies.append(time.perf_counter() - start)
+
+    # Allocation pass: keep each frame's outputs alive until the snapshot so
+    # that every buffer the function allocated shows up as a new block
+    tracemalloc.start(1)
+    blocks, peak_bytes = [], []
+    for frame in frames:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        outputs = fn(frame)
+        peak_bytes.append(tracemalloc.get_traced_memory()[1] - base)
+        blocks.append(count_new_blocks(before, tracemalloc.take_snapshot()))
+        del outputs
+    tracemalloc.stop()
+
+    latencies = np.array(latencies) * 1e3
+    print(
+        f"{name:<18}{np.median(latencies):>10.2f}{np.percentile(latencies, 95):>10.2f}"
+        f"{np.mean(blocks):>14.1f}{np.mean(peak_bytes) / 1024:>14.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+    print(f"{'path':<18}{'p50 ms':>10}{'p95 ms':>10}{'new blocks':>14}{'peak KiB':>14}")
+
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        run('legacy', lambda frame: legacy_preprocess(hands, frame), frames)
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        processor = FrameProcessor(hands)
+        run('FrameProcessor', lambda frame: processor_preprocess(processor, frame), frames)
+
+
+if __name__ == '__main__':
+    main()
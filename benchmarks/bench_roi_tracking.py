@@ -0,0 +1,74 @@
+"""
+Full-frame hand detection (FrameProcessor) vs ROI-cropped tracking
+(HandTracker) on recorded footage.
+
+Reports per-frame latency over all frames and over frames with a hand, the
+number of frames with a detection, how many frames were served from the
+crop, and the mean landmark offset from the full-frame result (normalized
+x/y, frames where both found a hand).
+
+Run from the repository root:
+    python -m benchmarks.bench_roi_tracking --video Imagine_a_world_where_V1.mp4
+    python -m benchmarks.bench_roi_tracking --roi-complexity 0
+"""
+import argparse
+import time
+
+import mediapipe as mp
+import numpy as np
+
+from benchmarks.bench_preprocess import read_frames
+from frame_processing import HANDS_CONFIG, FrameProcessor, HandTracker
+
+
+def run(processor, frames):
+    latencies, landmarks = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        result, _ = processor.process(frame)
+        latencies.append(time.perf_counter() - start)
+        landmarks.append(None if result is None else result.copy())
+    return np.array(latencies) * 1e3, landmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--margin', type=float, default=1.0)
+    parser.add_argument('--max-crop', type=int, default=256)
+    parser.add_argument('--roi-complexity', type=int, default=1, choices=[0, 1],
+                        help='MediaPipe model_complexity of the tracker that runs on the crops')
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        full_ms, full_landmarks = run(FrameProcessor(hands), frames)
+
+    roi_config = dict(HANDS_CONFIG, model_complexity=args.roi_complexity)
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands, mp.solutions.hands.Hands(**roi_config) as roi_hands:
+        tracker = HandTracker(hands, margin=args.margin, max_crop=args.max_crop, roi_hands=roi_hands)
+        roi_ms, roi_landmarks = run(tracker, frames)
+
+    hand = np.array([landmarks is not None for landmarks in full_landmarks])
+    print(f"{'path':<14}{'p50 ms':>9}{'p95 ms':>9}{'hand p50':>10}{'detected':>10}{'from crop':>11}")
+    for name, latencies, landmarks, from_crop in (
+        ('full frame', full_ms, full_landmarks, '-'),
+        ('ROI tracking', roi_ms, roi_landmarks, tracker.roi_frames),
+    ):
+        detected = sum(result is not None for result in landmarks)
+        print(
+            f"{name:<14}{np.median(latencies):>9.2f}{np.percentile(latencies, 95):>9.2f}"
+            f"{np.median(latencies[hand]):>10.2f}{detected:>10}{from_crop:>11}"
+        )
+
+    both = [i for i, (a, b) in enumerate(zip(full_landmarks, roi_landmarks)) if a is not None and b is not None]
+    offset = np.mean([np.abs(full_landmarks[i][..., :2] - roi_landmarks[i][..., :2]).mean() for i in both])
+    print(f"\nmean landmark offset vs full frame: {offset:.4f} over {len(both)} frames, tracking lost {tracker.lost} times")
+    print(f"hand-frame p50: {np.median(roi_ms[hand]) / np.median(full_ms[hand]) - 1:+.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Memory footprint and load latency per Streamlit session: one model per
+session vs the shared model.
+
+Each mode runs in a fresh interpreter that simulates N sessions loading the
+model the way example.py does and reports resident memory (VmRSS) and the
+model load time for each one.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_memory --sessions 4 --backend keras
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+SESSION_SNIPPET = """
+import json, sys, time
+from inference import get_gesture_classes, get_shared_predictor, load_predictor
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        return int(next(l for l in f if l.startswith('VmRSS')).split()[1]) / 1024
+
+mode, backend, sessions = sys.argv[1], sys.argv[2], int(sys.argv[3])
+session_state = []
+readings = [(rss_mb(), 0.0)]
+for _ in range(sessions):
+    start = time.perf_counter()
+    if mode == 'per-session':
+        model = load_predictor(backend=backend)
+    else:
+        model = get_shared_predictor(backend=backend)
+    session_state.append({'model': model, 'classes': get_gesture_classes()})
+    readings.append((rss_mb(), time.perf_counter() - start))
+print(json.dumps(readings))
+"""
+
+
+def measure(mode, backend, sessions):
+    out = subprocess.run(
+        [sys.executable, '-c', SESSION_SNIPPET, mode, backend, str(sessions)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--backend', default='keras', choices=['keras', 'numpy'])
+    args = parser.parse_args()
+
+    results = {mode: measure(mode, args.backend, args.sessions) for mode in ('per-session', 'shared')}
+
+    print(f"backend={args.backend}\n")
+    print(f"{'sessions':>9}{'per-session MB':>16}{'load s':>8}{'shared MB':>12}{'load s':>8}")
+    for n in range(args.sessions + 1):
+        (old_rss, old_s), (new_rss, new_s) = results['per-session'][n], results['shared'][n]
+        print(f"{n:>9}{old_rss:>16.1f}{old_s:>8.3f}{new_rss:>12.1f}{new_s:>8.3f}")
+
+    for mode, readings in results.items():
+        # The first session includes one-off framework imports; later ones are the marginal cost
+        rss = [r for r, _ in readings]
+        marginal = (rss[-1] - rss[1]) / max(args.sessions - 1, 1)
+        print(f"\n{mode}: first session +{rss[1] - rss[0]:.1f} MB, each further session +{marginal:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
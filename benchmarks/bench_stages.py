@@ -0,0 +1,176 @@
+"""
+Per-stage latency of the live recognition path, driven by a video file.
+
+Frames are fed through the functions the Real-time Recognition loop uses,
+one stage at a time, without a camera or Streamlit:
+
+    cvtColor        FrameProcessor.to_rgb (BGR -> RGB)
+    hands.process   MediaPipe hand landmark detection
+    landmarks       FrameProcessor.fill_hands, the landmarks into the model input tensor
+    predict         the gesture model (GESTURE_BACKEND / --backend)
+    decode          argmax + label lookup, as decode_prediction
+    draw_landmarks  MediaPipe drawing with the RGB hand styles
+    putText         the prediction label
+    image push      JPEG encoding as VideoPublisher sends it to the browser
+
+Stages after hands.process only run on frames with a hand. Decoding the
+video is not timed. The report is JSON: p50/p95/p99/mean milliseconds and
+call count per stage, end-to-end per frame, and the end-to-end FPS.
+
+With --baseline, the run is compared to a previous report and the script
+exits non-zero when a stage's p50 or p95, or the end-to-end p50, is more
+than --threshold slower (and by more than --min-ms, so microsecond stages
+do not fail on noise). --save writes the report, e.g. to create a baseline.
+benchmarks/stage_baseline.json is the committed one; latencies depend on
+the machine, so re-save it on the machine that runs the comparison:
+
+    python -m benchmarks.bench_stages --baseline benchmarks/stage_baseline.json --threshold 0.2
+    python -m benchmarks.bench_stages --save benchmarks/stage_baseline.json
+
+Run from the repository root.
+"""
+import argparse
+import json
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from frame_processing import HANDS_CONFIG, FrameProcessor, rgb_hand_styles
+from inference import DEFAULT_BACKEND, MODEL_PATH, get_gesture_classes, load_predictor
+from video_analysis import iter_video_frames
+from video_publisher import encode_jpeg
+
+STAGES = ('cvtColor', 'hands.process', 'landmarks', 'predict', 'decode', 'draw_landmarks', 'putText', 'image push')
+
+
+def summarize(seconds):
+    ms = np.array(seconds) * 1e3
+    if not len(ms):
+        return {'count': 0}
+    return {
+        'count': len(ms),
+        'p50_ms': round(float(np.percentile(ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(ms, 99)), 4),
+        'mean_ms': round(float(ms.mean()), 4),
+    }
+
+
+def run(video, model_path, backend, warmup, limit):
+    predictor = load_predictor(model_path, backend=backend)
+    classes = get_gesture_classes()
+    landmark_style, connection_style = rgb_hand_styles()
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+    hand_frames = 0
+
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        processor = FrameProcessor(hands)
+        clock = time.perf_counter
+        for i, (_, frame) in enumerate(iter_video_frames(video, stop=limit)):
+            laps = {}
+            start = t = clock()
+            rgb = processor.to_rgb(frame)
+            laps['cvtColor'], t = clock() - t, clock()
+
+            rgb.flags.writeable = False
+            results = hands.process(rgb)
+            rgb.flags.writeable = True
+            laps['hands.process'], t = clock() - t, clock()
+
+            if results.multi_hand_landmarks:
+                landmarks = processor.fill_hands(results.multi_hand_landmarks[:1])
+                laps['landmarks'], t = clock() - t, clock()
+
+                prediction = predictor.predict(landmarks)
+                laps['predict'], t = clock() - t, clock()
+
+                index = int(np.argmax(prediction[0]))
+                label, confidence = classes[index], prediction[0][index]
+                laps['decode'], t = clock() - t, clock()
+
+                for hand_landmarks in results.multi_hand_landmarks:
+                    mp.solutions.drawing_utils.draw_landmarks(
+                        rgb, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS, landmark_style, connection_style,
+                    )
+                laps['draw_landmarks'], t = clock() - t, clock()
+
+                cv2.putText(rgb, f"{label} ({confidence:.2%})", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+                laps['putText'], t = clock() - t, clock()
+
+            encode_jpeg(rgb)
+            laps['image push'] = clock() - t
+            total = clock() - start
+
+            # The first frames pay for MediaPipe and model start-up
+            if i < warmup:
+                continue
+            hand_frames += 'landmarks' in laps
+            for stage, seconds in laps.items():
+                timings[stage].append(seconds)
+            totals.append(total)
+
+    return {
+        'video': video,
+        'model': model_path,
+        'backend': backend or DEFAULT_BACKEND,
+        'frames': len(totals),
+        'hand_frames': hand_frames,
+        'fps': round(len(totals) / sum(totals), 2),
+        'stages': {stage: summarize(seconds) for stage, seconds in timings.items()},
+        'end_to_end': summarize(totals),
+    }
+
+
+def compare(report, baseline, threshold, min_ms):
+    """
+    Regressions of report against baseline, as readable strings.
+    """
+    checks = [('end_to_end', 'p50_ms', report['end_to_end'], baseline['end_to_end'])]
+    for stage, current in report['stages'].items():
+        for key in ('p50_ms', 'p95_ms'):
+            checks.append((stage, key, current, baseline['stages'].get(stage, {})))
+    regressions = []
+    for name, key, current, previous in checks:
+        if key not in current or key not in previous:
+            continue
+        limit = previous[key] * (1 + threshold)
+        if current[key] > limit and current[key] - previous[key] > min_ms:
+            regressions.append(f"{name} {key}: {previous[key]:.3f} -> {current[key]:.3f} ms "
+                               f"(+{current[key] / previous[key] - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--backend', default=None, help='keras or numpy (default: GESTURE_BACKEND)')
+    parser.add_argument('--frames', type=int, default=None, help='stop after this many frames')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--save', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown, 0.2 = 20%%')
+    parser.add_argument('--min-ms', type=float, default=0.1, help='ignore slowdowns smaller than this')
+    args = parser.parse_args()
+
+    report = run(args.video, args.model, args.backend, args.warmup, args.frames)
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_ms)
+        if regressions:
+            sys.exit("Latency regressions against {}:\n  {}".format(args.baseline, '\n  '.join(regressions)))
+        print(f"No stage more than {args.threshold:.0%} slower than {args.baseline}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
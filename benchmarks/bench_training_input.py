@@ -0,0 +1,68 @@
+"""
+Training throughput of the gesture CNN: the notebook's model.fit on NumPy
+arrays vs the training_data tf.data pipeline (cache, shuffle, in-graph
+augmentation, prefetch), as the dataset grows.
+
+--samples lists dataset sizes; larger sizes are jittered copies of the
+store's samples. Steps/s is measured by StepRateCallback over the epochs
+after the first (which pays for tracing and filling the cache).
+
+Run from the repository root:
+    python -m benchmarks.bench_training_input --samples 615 10000 50000
+"""
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from augment import augment_tf
+from train import build_model
+from training_data import StepRateCallback, load_splits, make_dataset
+
+
+def grow(features, class_ids, samples, seed=0):
+    rng = np.random.default_rng(seed)
+    indices = np.arange(samples) % len(features)
+    noise = rng.normal(0, 0.002, (samples,) + features.shape[1:]).astype(np.float32)
+    return features[indices] + noise, class_ids[indices]
+
+
+def steps_per_second(fit, batch_size, epochs):
+    rate = StepRateCallback(batch_size)
+    history = fit(callbacks=[rate], epochs=epochs, verbose=0)
+    return float(np.mean(history.history['steps_per_second'][1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--samples', type=int, nargs='+', default=[615, 10000, 50000])
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=3)
+    args = parser.parse_args()
+
+    splits, class_names = load_splits(args.store)
+    features, class_ids = splits['train']
+    num_classes = len(class_names)
+
+    print(f"{'samples':>8}{'numpy fit steps/s':>20}{'tf.data steps/s':>18}{'+ augmentation':>16}")
+    for samples in args.samples:
+        x, y = grow(features, class_ids, samples)
+        tf.keras.utils.set_random_seed(0)
+
+        model = build_model(num_classes)
+        x_numpy, y_numpy = x.reshape((-1, 21, 3, 1)), tf.keras.utils.to_categorical(y, num_classes)
+        numpy_rate = steps_per_second(
+            lambda **kw: model.fit(x_numpy, y_numpy, batch_size=args.batch_size, **kw), args.batch_size, args.epochs,
+        )
+
+        rates = []
+        for augment in (None, augment_tf):
+            model = build_model(num_classes)
+            dataset = make_dataset(x, y, num_classes, args.batch_size, training=True, augment=augment)
+            rates.append(steps_per_second(lambda **kw: model.fit(dataset, **kw), args.batch_size, args.epochs))
+        print(f"{samples:>8}{numpy_rate:>20.0f}{rates[0]:>18.0f}{rates[1]:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Cost of two-hand recognition on recorded footage.
+
+Every frame goes through FrameProcessor.process and, when it has hands, one
+predict() call on the (n, 21, 3, 1) batch, for:
+
+    one hand       FrameProcessor(hands), the single-hand mode
+    always two     one Hands with max_num_hands=2 (TWO_HANDS_CONFIG) for every frame
+    search         FrameProcessor(hands, two_hands=...), looking for a second
+                   hand every --search-interval frames while one is tracked
+
+Per-frame p50 milliseconds are broken down by the number of hands the
+'always two' tracker sees in that frame, with the number of frames in which
+each mode found two hands. The model call is also timed on its own: one
+batched call for two hands vs one call per hand.
+
+Run from the repository root:
+    python -m benchmarks.bench_two_hands --video Imagine_a_world_where_V1.mp4
+"""
+import argparse
+import time
+
+import mediapipe as mp
+import numpy as np
+
+from benchmarks.bench_preprocess import read_frames
+from frame_processing import HANDS_CONFIG, TWO_HANDS_CONFIG, FrameProcessor
+from inference import MODEL_PATH, load_predictor
+
+
+def run(processor, predictor, frames):
+    latencies, counts = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        landmarks, _ = processor.process(frame)
+        if landmarks is not None:
+            predictor.predict(landmarks)
+        latencies.append(time.perf_counter() - start)
+        counts.append(0 if landmarks is None else len(landmarks))
+    return np.array(latencies) * 1e3, np.array(counts)
+
+
+def latency_us(fn, iterations):
+    fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--backend', default=None, help='keras, numpy, tflite or knn (default: GESTURE_BACKEND)')
+    parser.add_argument('--search-interval', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    predictor = load_predictor(args.model, backend=args.backend)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+
+    results = {}
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands:
+        results['one hand'] = run(FrameProcessor(hands), predictor, frames)
+    with mp.solutions.hands.Hands(**TWO_HANDS_CONFIG) as two_hands:
+        results['always two'] = run(FrameProcessor(two_hands, two_hands=two_hands), predictor, frames)
+    with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands, mp.solutions.hands.Hands(**TWO_HANDS_CONFIG) as two_hands:
+        processor = FrameProcessor(hands, two_hands=two_hands, search_interval=args.search_interval)
+        results['search'] = run(processor, predictor, frames)
+
+    visible = results['always two'][1]
+    print(f"{'mode':<12}{'all p50':>9}{'0 hands':>9}{'1 hand':>9}{'2 hands':>9}{'mean':>8}{'found 2':>9}")
+    for name, (latencies, counts) in results.items():
+        by_hands = [np.median(latencies[visible == n]) if (visible == n).any() else float('nan') for n in (0, 1, 2)]
+        print(f"{name:<12}{np.median(latencies):>9.2f}{by_hands[0]:>9.2f}{by_hands[1]:>9.2f}{by_hands[2]:>9.2f}"
+              f"{latencies.mean():>8.2f}{(counts == 2).sum():>9}")
+
+    rng = np.random.default_rng(0)
+    batch = rng.random((2, 21, 3, 1), dtype=np.float32)
+    batched = latency_us(lambda: predictor.predict(batch), args.iterations)
+    separate = latency_us(lambda: (predictor.predict(batch[:1]), predictor.predict(batch[1:])), args.iterations)
+    single = latency_us(lambda: predictor.predict(batch[:1]), args.iterations)
+    print(f"\npredict, 1 hand: {single:.1f} us; 2 hands: {batched:.1f} us batched, {separate:.1f} us as two calls")
+
+
+if __name__ == '__main__':
+    main()
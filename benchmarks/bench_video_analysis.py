@@ -0,0 +1,51 @@
+"""
+Offline video analysis throughput: frames/sec of analyze_video on a video
+file for a range of inference batch sizes, with the time split into
+decoding, MediaPipe landmarks and model inference. The last rows analyze
+the video twice through an empty LandmarkCache: the second run only hashes
+the file and runs the classifier.
+
+Run from the repository root:
+    python -m benchmarks.bench_video_analysis --video Imagine_a_world_where_V1.mp4 --batch-sizes 1,16,64
+"""
+import argparse
+import tempfile
+
+from inference import load_predictor
+from landmark_cache import LandmarkCache
+from video_analysis import analyze_video
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--backend', default='keras', choices=['keras', 'numpy'])
+    parser.add_argument('--batch-sizes', default='1,16,64')
+    parser.add_argument('--stride', type=int, default=1)
+    args = parser.parse_args()
+
+    predictor = load_predictor(backend=args.backend)
+    print(f"backend={args.backend}, video={args.video}\n")
+    print(f"{'batch':>14}{'frames':>8}{'hands':>7}{'fps':>10}{'decode s':>10}{'landmarks s':>13}{'inference s':>13}{'hash s':>8}")
+    batch_sizes = [int(batch_size) for batch_size in args.batch_sizes.split(',')]
+    for batch_size in batch_sizes:
+        stats = analyze_video(args.video, predictor, stride=args.stride, batch_size=batch_size).stats
+        print_row(batch_size, stats)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LandmarkCache(directory)
+        for label in ('cold', 'warm'):
+            stats = analyze_video(args.video, predictor, stride=args.stride, batch_size=batch_sizes[-1], cache=cache).stats
+            print_row(f"{batch_sizes[-1]}, {label} cache", stats)
+
+
+def print_row(label, stats):
+    print(
+        f"{label:>14}{stats['frames']:>8}{stats['hand_frames']:>7}{stats['fps']:>10.1f}"
+        f"{stats['decode_seconds']:>10.3f}{stats['landmarks_seconds']:>13.3f}{stats['inference_seconds']:>13.3f}"
+        f"{stats['hash_seconds']:>8.3f}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of getting live frames to the browser: st.image on raw RGB arrays (a
+full-resolution, quality 100 JPEG per recognition frame) vs VideoPublisher
+(rate-limited, downscaled JPEG).
+
+Part one measures Streamlit's own encoding of each frame against
+encode_jpeg. Part two feeds the publisher recognition-rate frames for a few
+seconds through a placeholder that only records what would be sent, and
+compares frames and bytes per second with publishing every frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_video_publisher --video Imagine_a_world_where_V1.mp4 --recognition-fps 30
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+from streamlit.elements.lib.image_utils import image_to_url
+
+from benchmarks.bench_preprocess import read_frames
+from video_publisher import VideoPublisher, encode_jpeg
+
+# st.image default: keep the original width
+ORIGINAL_WIDTH = -1
+
+
+class RecordingPlaceholder:
+    """
+    Stands in for st.empty(): keeps the size of every image it is given.
+    """
+
+    def __init__(self):
+        self.sizes = []
+
+    def image(self, data, output_format='auto'):
+        self.sizes.append(len(data))
+
+
+def streamlit_bytes(frame):
+    """
+    What st.image(frame) sends for an RGB array.
+    """
+    from streamlit.elements.lib.image_utils import _np_array_to_bytes
+    return _np_array_to_bytes(frame, 'auto')
+
+
+def time_per_frame(fn, frames):
+    start = time.perf_counter()
+    sizes = [len(fn(frame)) for frame in frames]
+    return (time.perf_counter() - start) / len(frames) * 1e3, np.mean(sizes) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--recognition-fps', type=float, default=30)
+    parser.add_argument('--seconds', type=float, default=4)
+    parser.add_argument('--target-fps', type=float, default=15)
+    parser.add_argument('--max-width', type=int, default=640)
+    parser.add_argument('--max-height', type=int, default=480)
+    parser.add_argument('--quality', type=int, default=70)
+    args = parser.parse_args()
+
+    frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in read_frames(args.video, args.frames)]
+    max_size = (args.max_width, args.max_height)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+
+    print(f"{'encoding':<34}{'ms/frame':>10}{'KiB/frame':>12}")
+    st_image_ms, _ = time_per_frame(
+        lambda frame: image_to_url(frame, ORIGINAL_WIDTH, False, 'RGB', 'auto', 'bench') or b'', frames
+    )
+    array_ms, array_kib = time_per_frame(streamlit_bytes, frames)
+    jpeg_ms, jpeg_kib = time_per_frame(lambda frame: encode_jpeg(frame, max_size, args.quality), frames)
+    print(f"{'st.image(array) full path':<34}{st_image_ms:>10.2f}{'':>12}")
+    print(f"{'JPEG q100, full resolution':<34}{array_ms:>10.2f}{array_kib:>12.1f}")
+    print(f"{f'JPEG q{args.quality}, <= {args.max_width}x{args.max_height}':<34}{jpeg_ms:>10.2f}{jpeg_kib:>12.1f}")
+
+    placeholder = RecordingPlaceholder()
+    publisher = VideoPublisher(placeholder, args.target_fps, max_size, args.quality).start()
+    interval = 1.0 / args.recognition_fps
+    deadline = time.monotonic() + args.seconds
+    i = 0
+    while time.monotonic() < deadline:
+        publisher.submit(frames[i % len(frames)])
+        i += 1
+        time.sleep(interval)
+    publisher.stop()
+    stats = publisher.stats()
+
+    print(f"\n{args.recognition_fps:g} fps recognition for {args.seconds:g} s ({publisher.submitted} frames)")
+    print(f"{'publishing':<34}{'fps':>10}{'KiB/s':>12}")
+    print(f"{'every frame, st.image(array)':<34}{args.recognition_fps:>10.1f}{args.recognition_fps * array_kib:>12.0f}")
+    print(f"{'VideoPublisher':<34}{stats['publish_fps']:>10.1f}{stats['kbytes_per_second']:>12.0f}")
+    print(f"skipped {stats['skipped']} frames, encode {stats['encode_ms']:.2f} ms per published frame")
+
+
+if __name__ == '__main__':
+    main()
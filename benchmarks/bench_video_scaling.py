@@ -0,0 +1,69 @@
+"""
+Scaling of analyze_video_parallel with the number of worker processes.
+
+The clip can be repeated into a longer temporary file (--repeat) to stand in
+for a multi-minute recording. Each worker count is timed end to end,
+including process start-up and model loading, and compared with the
+single-process analyze_video: wall time, frames/sec, speedup and the share
+of frames whose label matches the single-process run (shard boundaries
+restart MediaPipe's tracker, softened by the overlap).
+
+Run from the repository root:
+    python -m benchmarks.bench_video_scaling --workers 1,2,4 --repeat 4 --backend numpy
+"""
+import argparse
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from inference import load_predictor
+from video_analysis import analyze_video, analyze_video_parallel, iter_video_frames, video_info
+
+
+def repeat_video(path, repeat, out_path):
+    _, fps = video_info(path)
+    writer = None
+    for _ in range(repeat):
+        for _, frame in iter_video_frames(path):
+            if writer is None:
+                height, width = frame.shape[:2]
+                writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+            writer.write(frame)
+    writer.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', default='Imagine_a_world_where_V1.mp4')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--overlap', type=int, default=30)
+    parser.add_argument('--backend', default='keras', choices=['keras', 'numpy'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if args.repeat > 1:
+            video = os.path.join(tmp, 'repeated.mp4')
+            repeat_video(args.video, args.repeat, video)
+        frame_count, fps = video_info(video)
+        print(f"{frame_count} frames ({frame_count / fps:.0f} s of video), {os.cpu_count()} CPUs, backend={args.backend}\n")
+
+        baseline = analyze_video(video, load_predictor(backend=args.backend))
+        print(f"{'workers':>8}{'wall s':>9}{'fps':>8}{'speedup':>9}{'busy s':>8}{'agree':>8}")
+        print(f"{'inline':>8}{baseline.stats['seconds']:>9.2f}{baseline.stats['fps']:>8.1f}{1:>9.2f}{'':>8}{'':>8}")
+        for workers in map(int, args.workers.split(',')):
+            result = analyze_video_parallel(video, workers=workers, overlap=args.overlap, backend=args.backend)
+            stats = result.stats
+            busy = stats['decode_seconds'] + stats['landmarks_seconds'] + stats['inference_seconds']
+            agree = np.mean(result.class_indices == baseline.class_indices)
+            print(
+                f"{workers:>8}{stats['seconds']:>9.2f}{stats['fps']:>8.1f}"
+                f"{baseline.stats['seconds'] / stats['seconds']:>9.2f}{busy:>8.2f}{agree:>8.1%}"
+            )
+
+
+if __name__ == '__main__':
+    main()
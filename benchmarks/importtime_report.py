@@ -0,0 +1,116 @@
+"""
+Cold-start import report per page, parsed from `python -X importtime`.
+
+Each profile runs in a fresh interpreter. Page profiles execute example.py
+once with Streamlit's AppTest harness; the harness's own imports are measured
+separately and subtracted, so the numbers are what the page itself loads.
+The 'camera' profile loads what the camera features need on first use.
+
+Run from the repository root:
+    python -m benchmarks.importtime_report
+    python -m benchmarks.importtime_report --json importtime.json --forbid Welcome:tensorflow,mediapipe,cv2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+HEAVY_PACKAGES = ('tensorflow', 'keras', 'mediapipe', 'cv2', 'jax')
+
+HARNESS = "from streamlit.testing.v1 import AppTest\n"
+PAGE_SNIPPET = HARNESS + (
+    "at = AppTest.from_file('example.py', default_timeout=600)\n"
+    "at.session_state['page'] = {page!r}\n"
+    "at.run()\n"
+)
+PROFILES = {
+    'harness': HARNESS,
+    'Welcome': PAGE_SNIPPET.format(page='Welcome'),
+    'Main': PAGE_SNIPPET.format(page='Main'),
+    'camera': HARNESS + (
+        "import mediapipe as mp, frame_processing, capture\n"
+        "from inference import get_shared_predictor\n"
+        "get_shared_predictor()\n"
+        "mp.solutions.hands.Hands(**frame_processing.HANDS_CONFIG)\n"
+    ),
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output into {module: self_us}.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_profile(code, env):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(modules, baseline, top):
+    """
+    Total import time and per-package breakdown of modules not in the baseline.
+    """
+    own = {name: us for name, us in modules.items() if name not in baseline}
+    packages = defaultdict(int)
+    for name, us in own.items():
+        packages[name.split('.')[0]] += us
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        'total_ms': round(sum(own.values()) / 1e3, 1),
+        'modules': len(own),
+        'heavy_loaded': sorted(p for p in HEAVY_PACKAGES if p in packages),
+        'top_packages_ms': {name: round(us / 1e3, 1) for name, us in ranked[:top]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', default='Welcome,Main,camera', help='comma separated: ' + ','.join(PROFILES))
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--json', help='also write the report to this file')
+    parser.add_argument('--forbid', action='append', default=[],
+                        help='PROFILE:pkg1,pkg2 -- exit non-zero if the profile imports any of them')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    baseline = run_profile(PROFILES['harness'], env)
+
+    report = {}
+    for name in args.profiles.split(','):
+        report[name] = summarize(run_profile(PROFILES[name], env), baseline, args.top)
+
+    for name, summary in report.items():
+        heavy = ', '.join(summary['heavy_loaded']) or 'none'
+        print(f"{name}: {summary['total_ms']:.0f} ms, {summary['modules']} modules, heavy: {heavy}")
+        for package, ms in summary['top_packages_ms'].items():
+            print(f"    {package:<28}{ms:>10.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    for rule in args.forbid:
+        profile, packages = rule.split(':')
+        loaded = set(report.get(profile, {}).get('heavy_loaded', [])) & set(packages.split(','))
+        if loaded:
+            failures.append(f"{profile} imports {', '.join(sorted(loaded))}")
+    if failures:
+        sys.exit('; '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class ThreadedCapture:
+    """
+    cv2.VideoCapture that grabs frames on a dedicated thread.
+
+    Frames go into a small ring buffer and read() always returns the newest
+    one, so a slow consumer skips stale frames instead of letting the driver
+    queue back up. Frames that were captured but never handed out are counted
+    in frames_dropped. Mirrors the isOpened/read/release interface of
+    cv2.VideoCapture so it can replace it in the existing loops.
+    """
+
+    def __init__(self, source=0, width=None, height=None, fourcc=None, fps=None, buffer_size=2):
+        self.cap = cv2.VideoCapture(source)
+
+        # FOURCC has to be set before the resolution on most V4L2/DirectShow drivers
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Keep the driver queue short; buffering happens in our ring instead
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._frames = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._delivered_seq = 0
+        self._last_read_seq = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self._started_at = time.monotonic()
+
+        self._running = self.cap.isOpened()
+        self._thread = threading.Thread(target=self._grab_loop, name='ThreadedCapture', daemon=True)
+        if self._running:
+            self._thread.start()
+
+    def _grab_loop(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            with self._cond:
+                if not ret:
+                    self._running = False
+                    self._cond.notify_all()
+                    break
+                self._seq += 1
+                self.frames_captured += 1
+                self._frames.append((self._seq, frame))
+                self._cond.notify_all()
+
+    def wait_frame(self, after_seq=0, timeout=1.0):
+        """
+        Block until a frame newer than after_seq is available.
+        Returns (seq, frame), or (None, None) on timeout or end of stream.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: (self._frames and self._frames[-1][0] > after_seq) or not self._running,
+                timeout=timeout,
+            )
+            if not ready or not self._frames or self._frames[-1][0] <= after_seq:
+                return None, None
+
+            seq, frame = self._frames[-1]
+            if seq > self._delivered_seq:
+                # Everything between the last delivered frame and this one was never seen
+                self.frames_dropped += seq - self._delivered_seq - 1
+                self._delivered_seq = seq
+            return seq, frame
+
+    def read(self, timeout=1.0):
+        """
+        Return (True, frame) with the newest frame not yet returned by read(),
+        or (False, None) when the stream has ended or timed out.
+        """
+        seq, frame = self.wait_frame(self._last_read_seq, timeout)
+        if seq is None:
+            return False, None
+        self._last_read_seq = seq
+        return True, frame
+
+    @property
+    def running(self):
+        return self._running
+
+    def isOpened(self):
+        """
+        True while the device is running or a buffered frame is still unread.
+        """
+        with self._cond:
+            return self._running or bool(self._frames and self._frames[-1][0] > self._last_read_seq)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def stats(self):
+        """
+        Capture counters: frames captured/dropped and the measured capture FPS.
+        """
+        elapsed = time.monotonic() - self._started_at
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'capture_fps': self.frames_captured / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def release(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        # Releasing the device while the grab thread is inside cap.read() is undefined in OpenCV,
+        # so wait for the read in progress to return
+        if self._thread.is_alive():
+            self._thread.join()
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraHandle:
+    """
+    One consumer's view of a shared ThreadedCapture.
+    Each handle tracks its own position, so every consumer sees every new
+    frame once regardless of how many other handles are reading.
+    """
+
+    def __init__(self, manager, index, capture):
+        self._manager = manager
+        self._index = index
+        self.capture = capture
+        self._last_seq = 0
+        self._released = False
+
+    def read(self, timeout=1.0):
+        """
+        Return (True, frame) with the newest frame this handle has not seen yet,
+        or (False, None) on timeout or when the device has stopped.
+        """
+        seq, frame = self.capture.wait_frame(self._last_seq, timeout)
+        if seq is None:
+            return False, None
+        self._last_seq = seq
+        return True, frame
+
+    def isOpened(self):
+        return not self._released and self.capture.running
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def stats(self):
+        return self.capture.stats()
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._manager._release(self._index, self.capture)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraManager:
+    """
+    Process-wide registry that keeps one open ThreadedCapture per device index.
+
+    acquire() hands out reference-counted CameraHandles. When the last handle
+    is released the device stays open for idle_timeout seconds, so Streamlit
+    reruns and tab switches reuse it instead of paying for a reopen (and the
+    exposure reset some drivers do on open).
+    """
+
+    def __init__(self, idle_timeout=10.0):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._cameras = {}
+        self._refs = {}
+        self._idle_since = {}
+        self._reaper = None
+
+    def acquire(self, index=0, **settings):
+        """
+        Return a handle to camera `index`, opening it with `settings` (see
+        ThreadedCapture) if it is not already open. Settings are ignored for
+        a camera that is already running.
+        """
+        stopped = None
+        with self._lock:
+            capture = self._cameras.get(index)
+            if capture is None or not capture.running:
+                stopped = capture
+                capture = ThreadedCapture(index, **settings)
+                self._cameras[index] = capture
+                self._refs[index] = 0
+            self._refs[index] += 1
+            self._idle_since.pop(index, None)
+            self._start_reaper()
+            handle = CameraHandle(self, index, capture)
+        # Outside the lock: release() waits for the grab thread
+        if stopped is not None:
+            stopped.release()
+        return handle
+
+    def _release(self, index, capture):
+        with self._lock:
+            # Handles of a device that stopped and was reopened since hold the old capture,
+            # whose references were dropped with it
+            if self._cameras.get(index) is not capture:
+                return
+            self._refs[index] -= 1
+            if self._refs[index] == 0:
+                self._idle_since[index] = time.monotonic()
+
+    def _start_reaper(self):
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap_loop, name='CameraManager-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(min(1.0, self.idle_timeout))
+            idle = []
+            with self._lock:
+                now = time.monotonic()
+                for index, since in list(self._idle_since.items()):
+                    if now - since >= self.idle_timeout:
+                        idle.append(self._cameras.pop(index))
+                        self._refs.pop(index)
+                        self._idle_since.pop(index)
+                done = not self._cameras
+                if done:
+                    self._reaper = None
+            # Outside the lock, so a grab that hangs does not block acquire()
+            for capture in idle:
+                capture.release()
+            if done:
+                return
+
+    def open_cameras(self):
+        """
+        Map of device index -> number of active handles.
+        """
+        with self._lock:
+            return dict(self._refs)
+
+    def close_all(self):
+        with self._lock:
+            captures = list(self._cameras.values())
+            self._cameras.clear()
+            self._refs.clear()
+            self._idle_since.clear()
+        for capture in captures:
+            capture.release()
+
+
+# Shared by every Streamlit session in this process
+camera_manager = CameraManager()
@@ -0,0 +1,213 @@
+import argparse
+import queue
+import threading
+import time
+
+import numpy as np
+
+from landmark_store import FEATURE_SHAPE, LandmarkStore
+
+# Tells the writer thread to flush and exit
+_STOP = object()
+
+
+class SampleWriter:
+    """
+    Background writer that appends landmark samples to a LandmarkStore in batches.
+
+    put() only copies the sample onto a queue, so the capture loop never
+    waits for the disk. The writer thread appends whenever batch_size
+    samples are pending or flush_interval seconds have passed since the last
+    write, and writes whatever is left on close().
+    """
+
+    def __init__(self, store, batch_size=64, flush_interval=1.0):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queued = 0
+        self.written = 0
+        self.batches = 0
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='SampleWriter', daemon=True)
+        self._thread.start()
+
+    def put(self, landmarks, label):
+        if self.error is not None:
+            raise RuntimeError("Sample writer failed") from self.error
+        self._queue.put((np.array(landmarks, dtype=np.float32).reshape(FEATURE_SHAPE), label))
+        self.queued += 1
+
+    @property
+    def pending(self):
+        return self.queued - self.written
+
+    def _run(self):
+        pending = []
+        last_write = time.monotonic()
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_write), 0.01)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not _STOP and item is not None:
+                pending.append(item)
+            if pending and (
+                item is _STOP or len(pending) >= self.batch_size
+                or time.monotonic() - last_write >= self.flush_interval
+            ):
+                self._write(pending)
+                pending = []
+                last_write = time.monotonic()
+            if item is _STOP:
+                return
+
+    def _write(self, samples):
+        features = np.stack([features for features, _ in samples])
+        try:
+            self.store.append(features, [label for _, label in samples])
+        except Exception as e:
+            self.error = e
+            raise
+        self.written += len(samples)
+        self.batches += 1
+
+    def close(self):
+        """
+        Write all queued samples and stop the thread.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.error is not None:
+            raise RuntimeError("Sample writer failed") from self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SampleSampler:
+    """
+    Decides which detected frames become samples.
+
+    Every `sample_every`-th hand frame of a label is considered, and it is
+    kept only if its landmarks moved by at least `min_change` (mean absolute
+    difference of the normalized coordinates) from the label's last kept
+    sample, so holding a pose still does not fill the store with duplicates.
+    """
+
+    def __init__(self, sample_every=1, min_change=0.0):
+        self.sample_every = sample_every
+        self.min_change = min_change
+        self._seen = {}
+        self._last = {}
+
+    def accept(self, landmarks, label):
+        seen = self._seen.get(label, 0)
+        self._seen[label] = seen + 1
+        if seen % self.sample_every:
+            return False
+        last = self._last.get(label)
+        if last is not None and np.mean(np.abs(landmarks - last)) < self.min_change:
+            return False
+        self._last[label] = np.array(landmarks, dtype=np.float32)
+        return True
+
+
+def collect_session(labels, store_path='sign_language_data1.lmstore', samples_per_label=100, sample_every=1,
+                    min_change=0.005, camera=0, window='Data collection'):
+    """
+    Record samples for several labels in one camera session.
+
+    Keys in the preview window: space starts/pauses recording, n / p switch
+    to the next / previous label, q quits. Recording pauses and moves to the
+    next label once samples_per_label samples were kept for the current one.
+    Returns {label: samples kept this session}.
+    """
+    import cv2
+    import mediapipe as mp
+
+    from capture import ThreadedCapture
+    from frame_processing import HANDS_CONFIG, FrameProcessor
+
+    # Labels typed as "A, B" would otherwise store " B" as a sign of its own
+    labels = [label.strip() for label in labels]
+    store = LandmarkStore.open_or_create(store_path)
+    sampler = SampleSampler(sample_every, min_change)
+    counts = {label: 0 for label in labels}
+    current = 0
+    recording = False
+    frames = 0
+    started = time.monotonic()
+    shown = False
+
+    cap = ThreadedCapture(camera)
+    try:
+        with mp.solutions.hands.Hands(**HANDS_CONFIG) as hands, SampleWriter(store) as writer:
+            processor = FrameProcessor(hands)
+            mp_drawing = mp.solutions.drawing_utils
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames += 1
+                label = labels[current]
+
+                landmarks, hand_landmarks = processor.process(frame)
+                if hand_landmarks:
+                    mp_drawing.draw_landmarks(frame, hand_landmarks[0], mp.solutions.hands.HAND_CONNECTIONS)
+                    if recording and sampler.accept(landmarks, label):
+                        writer.put(landmarks, label)
+                        counts[label] += 1
+                        if counts[label] >= samples_per_label:
+                            recording = False
+                            current = min(current + 1, len(labels) - 1)
+
+                fps = frames / (time.monotonic() - started)
+                state = 'REC' if recording else 'paused'
+                cv2.putText(frame, f"{label}: {counts[label]}/{samples_per_label} [{state}]", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255) if recording else (0, 255, 0), 2)
+                cv2.putText(frame, f"{fps:.0f} fps, {writer.pending} pending, space/n/p/q", (10, 60),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                cv2.imshow(window, frame)
+                shown = True
+
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord(' '):
+                    recording = not recording
+                elif key == ord('n'):
+                    current, recording = min(current + 1, len(labels) - 1), False
+                elif key == ord('p'):
+                    current, recording = max(current - 1, 0), False
+    finally:
+        cap.release()
+        # destroyWindow raises for a window that was never shown, hiding the original error
+        if shown:
+            cv2.destroyWindow(window)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record hand landmark samples for several labels into a landmark store.")
+    parser.add_argument('labels', help='comma separated, e.g. hello,yes,no')
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--samples-per-label', type=int, default=100)
+    parser.add_argument('--sample-every', type=int, default=1, help='consider every n-th hand frame')
+    parser.add_argument('--min-change', type=float, default=0.005, help='minimum mean landmark change between samples')
+    parser.add_argument('--camera', type=int, default=0)
+    args = parser.parse_args()
+    counts = collect_session(
+        args.labels.split(','), args.store, args.samples_per_label, args.sample_every, args.min_change, args.camera,
+    )
+    for label, count in counts.items():
+        print(f"{label}: {count} samples")
+
+
+if __name__ == '__main__':
+    main()
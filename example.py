@@ -1,32 +1,143 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
 import base64
+import os
+import shutil
+import tempfile
 from PIL import Image
 import time
 import numpy as np
-import cv2
 import pandas as pd
 from datetime import datetime
-from tensorflow.keras.models import load_model
+from inference import DEFAULT_BACKEND, MODEL_PATH, get_gesture_classes, get_shared_predictor
+from landmark_cache import LandmarkCache
+from lazy_imports import lazy_import
+from metrics import LoopMetrics, serve_metrics
+from pipeline import FramePipeline, Stage
+from prediction_state import HandSmoothers, MotionGate, PredictionDisplay
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 from random import choice, shuffle
 from collections import deque
-import mediapipe as mp
-
-# Initialize MediaPipe Hands
-gesture_classes = [
-    'dad', 'good morning', 'hello', 'help', 'i', 'love you', 'me', 'mom',
-    'need', 'no', 'pineapple', 'sorry', 'want', 'yes', 'your'
-]
-
-# Initialize MediaPipe
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
+
+# Vision stack is imported on first use, so pages without a camera start fast
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+frame_processing = lazy_import('frame_processing')
+capture = lazy_import('capture')
+video_publisher = lazy_import('video_publisher')
+video_analysis = lazy_import('video_analysis')
+
+# Gesture labels, loaded once per process and shared by all sessions
+gesture_classes = list(get_gesture_classes('label_map.pkl'))
+
+def get_hands():
+    """
+    MediaPipe Hands tracker for this session, created on first use by a camera feature.
+    """
+    if 'hands' not in st.session_state:
+        st.session_state.hands = mp.solutions.hands.Hands(**frame_processing.HANDS_CONFIG)
+    return st.session_state.hands
+
+def get_two_hands():
+    """
+    This session's MediaPipe tracker for the second hand (TWO_HANDS_CONFIG), created on first use.
+    """
+    if 'two_hands' not in st.session_state:
+        st.session_state.two_hands = mp.solutions.hands.Hands(**frame_processing.TWO_HANDS_CONFIG)
+    return st.session_state.two_hands
+
+def get_roi_hands():
+    """
+    This session's MediaPipe tracker for HandTracker crops (ROI_TRACKING), created on first use.
+    """
+    if 'roi_hands' not in st.session_state:
+        st.session_state.roi_hands = mp.solutions.hands.Hands(
+            **dict(frame_processing.HANDS_CONFIG, model_complexity=ROI_TRACKING['roi_complexity'])
+        )
+    return st.session_state.roi_hands
+
+def get_model():
+    """
+    Shared gesture model, loaded on first use by a camera feature.
+    Returns None and shows the error if the model cannot be loaded.
+    """
+    try:
+        # One model per process, shared read-only by every session
+        return get_shared_predictor(MODEL_PATH)
+    except Exception as e:
+        st.error(f"Error loading model: {str(e)}")
+        return None
+
+# Camera settings for the live loops: MediaPipe does not need more than 640x480
+CAMERA_CONFIG = dict(width=640, height=480, fourcc=None, buffer_size=2)
+
+# ROI-cropped hand tracking for the continuous camera loops (see benchmarks/bench_roi_tracking.py).
+# roi_complexity=0 runs MediaPipe's lite landmark model on the crops: much faster, slightly less precise.
+ROI_TRACKING = dict(enabled=False, margin=1.0, max_crop=256, roi_complexity=1)
+
+# Up to two hands in the continuous camera loops, classified in one model call. While only one
+# hand is tracked, the two-hand tracker looks for a second one every search_interval frames.
+# mirrored: whether camera frames are flipped like a selfie view (for the Left/Right labels).
+# ROI tracking follows a single hand and takes precedence.
+MULTI_HAND = dict(enabled=True, search_interval=5, mirrored=False)
+
+# Reuse the last prediction while the landmarks move less than epsilon (mean abs, normalized
+# coordinates), re-classifying at least every max_age seconds
+MOTION_GATE = dict(epsilon=0.004, max_age=0.5)
+
+# Live labels: EMA (or 'majority') over each hand's last `window` probability vectors; the prediction
+# box is re-rendered only when the label or its confidence_step bucket changes
+PREDICTION_SMOOTHING = dict(window=8, method='ema', alpha=0.3)
+PREDICTION_DISPLAY = dict(confidence_step=0.05)
+# Labels listed per hand in the prediction box. The knn backend's neighbour-distance scores also
+# rank the runner-ups, so it shows the next two as well
+PREDICTION_TOP_K = 3 if DEFAULT_BACKEND == 'knn' else 1
+
+# Live video sent to the browser: at most target_fps, max_size (width, height), JPEG quality
+VIDEO_PUBLISHER = dict(target_fps=15, max_size=(640, 480), jpeg_quality=70)
+
+# Uploaded videos: hand frames classified batch_size at a time; segments shorter than min_frames hidden.
+# Videos with at least parallel_min_frames frames are split over `workers` processes.
+VIDEO_ANALYSIS = dict(batch_size=64, min_frames=3, parallel_min_frames=3000, workers=os.cpu_count() or 1, overlap=30)
+
+# Landmarks of analyzed videos, so re-analyzing the same file only re-runs the classifier
+LANDMARK_CACHE = dict(directory='.landmark_cache', max_bytes=256 * 2 ** 20)
+
+# Live loop instrumentation (per-stage timers, FPS, hand-detection rate, dropped frames), off unless
+# GESTURE_METRICS=1. overlay: 'sidebar', 'frame' or None. Prometheus text format is written to
+# GESTURE_METRICS_FILE and/or served at http://127.0.0.1:GESTURE_METRICS_PORT/metrics when set.
+INSTRUMENTATION = dict(
+    enabled=os.environ.get('GESTURE_METRICS') == '1',
+    overlay='sidebar',
+    textfile=os.environ.get('GESTURE_METRICS_FILE'),
+    port=int(os.environ['GESTURE_METRICS_PORT']) if os.environ.get('GESTURE_METRICS_PORT') else None,
 )
 
+def make_frame_processor(reuse_buffers=True, metrics=None):
+    """
+    Frame processor for one continuous stream: HandTracker when ROI_TRACKING
+    is enabled, otherwise full-frame FrameProcessor, for two hands when
+    MULTI_HAND is enabled.
+    """
+    if not ROI_TRACKING['enabled']:
+        return frame_processing.FrameProcessor(
+            get_hands(),
+            reuse_buffers=reuse_buffers,
+            metrics=metrics,
+            two_hands=get_two_hands() if MULTI_HAND['enabled'] else None,
+            search_interval=MULTI_HAND['search_interval'],
+            mirrored=MULTI_HAND['mirrored'],
+        )
+    return frame_processing.HandTracker(
+        get_hands(),
+        reuse_buffers=reuse_buffers,
+        margin=ROI_TRACKING['margin'],
+        max_crop=ROI_TRACKING['max_crop'],
+        roi_hands=get_roi_hands(),
+        metrics=metrics,
+        mirrored=MULTI_HAND['mirrored'],
+    )
+
 class GestureAI:
     def __init__(self):
         # Comprehensive Knowledge Base with 10 detailed Q&A pairs
@@ -377,44 +488,51 @@ def show_pricing_modal():
         
         st.markdown('</div>', unsafe_allow_html=True)
 
-def preprocess_frame(frame):
+def preprocess_frame(frame, processor=None):
     """
     Preprocess the frame using MediaPipe Hands to extract hand landmarks.
-    Reshapes the landmarks to match the model's expected input shape (None, 21, 3, 1).
+    Returns landmarks in the model's expected input shape (None, 21, 3, 1),
+    one row per hand; processor.handedness names the hand of each row.
+    Pass the stream's FrameProcessor to reuse its buffers; the returned array
+    and processor.rgb are overwritten by the next frame.
     """
     try:
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Process the frame and detect hands
-        results = hands.process(frame_rgb)
-        
-        if results.multi_hand_landmarks:
-            # Get landmarks of the first detected hand
-            hand_landmarks = results.multi_hand_landmarks[0]
-            
-            # Extract 3D coordinates of 21 landmarks
-            landmarks_array = []
-            for landmark in hand_landmarks.landmark:
-                landmarks_array.extend([landmark.x, landmark.y, landmark.z])
-            
-            # Convert to numpy array and reshape to (None, 21, 3, 1)
-            landmarks_array = np.array(landmarks_array, dtype=np.float32)
-            landmarks_array = landmarks_array.reshape(1, 21, 3, 1)
-            
-            return landmarks_array, results.multi_hand_landmarks
-        else:
-            return None, None
+        if processor is None:
+            processor = frame_processing.FrameProcessor(get_hands())
+
+        # Single BGR->RGB conversion, landmarks written into a preallocated tensor
+        return processor.process(frame)
             
     except Exception as e:
         st.error(f"Error in preprocessing: {str(e)}")
         return None, None
 
-def decode_prediction(prediction):
+def decode_prediction(prediction, handedness=None, top_k=1):
     """
     Convert model prediction to gesture label.
+    With handedness (one name per prediction row, e.g. processor.handedness),
+    returns a list of (hand, label, confidence), one per hand.
+    With top_k above 1, label and confidence are lists of the top_k labels
+    and their scores instead, best first.
     """
     try:
+        if top_k > 1:
+            order = np.argsort(prediction, axis=1)[:, ::-1][:, :top_k]
+            ranked = [
+                ([gesture_classes[index] for index in indices], [row[index] for index in indices])
+                for indices, row in zip(order, prediction)
+            ]
+            if handedness is not None:
+                return [(hand,) + labels for hand, labels in zip(handedness, ranked)]
+            return ranked[0]
+
+        if handedness is not None:
+            indices = np.argmax(prediction, axis=1)
+            return [
+                (hand, gesture_classes[index], row[index])
+                for hand, index, row in zip(handedness, indices, prediction)
+            ]
+
         # Get prediction index and confidence
         pred_index = np.argmax(prediction[0])
         confidence = prediction[0][pred_index]
@@ -422,27 +540,161 @@ def decode_prediction(prediction):
         return gesture_classes[pred_index], confidence
     except Exception as e:
         st.error(f"Error in decoding prediction: {str(e)}")
-        return "Unknown", 0.0
+        unknown = (["Unknown"], [0.0]) if top_k > 1 else ("Unknown", 0.0)
+        if handedness is not None:
+            return [(hand,) + unknown for hand in handedness]
+        return unknown
 
-def draw_landmarks(frame, hand_landmarks):
+def draw_landmarks(frame, hand_landmarks, rgb=False):
     """
     Draw hand landmarks on the frame for visualization.
+    Set rgb=True when drawing on an RGB frame such as FrameProcessor.rgb.
     """
     if hand_landmarks:
         mp_drawing = mp.solutions.drawing_utils
         mp_drawing_styles = mp.solutions.drawing_styles
+
+        if rgb:
+            landmark_style, connection_style = frame_processing.rgb_hand_styles()
+        else:
+            landmark_style = mp_drawing_styles.get_default_hand_landmarks_style()
+            connection_style = mp_drawing_styles.get_default_hand_connections_style()
         
         for hand_lms in hand_landmarks:
             mp_drawing.draw_landmarks(
                 frame,
                 hand_lms,
-                mp_hands.HAND_CONNECTIONS,
-                mp_drawing_styles.get_default_hand_landmarks_style(),
-                mp_drawing_styles.get_default_hand_connections_style()
+                mp.solutions.hands.HAND_CONNECTIONS,
+                landmark_style,
+                connection_style
             )
     
     return frame
 
+def build_recognition_pipeline(cap, predictor, gate=None, smoother=None, metrics=None, overlay=False, top_k=1):
+    """
+    Build the landmarks -> classify -> render pipeline for the live camera loop.
+    Each stage runs on its own thread; the caller publishes the finished
+    packets to Streamlit from the script thread.
+    All hands of a frame are classified in one model call. packet['hands']
+    lists (hand, gesture, confidence) per hand and packet['gesture'] /
+    packet['confidence'] are those of the first.
+    With a MotionGate, still frames reuse the last prediction (packet['cached']);
+    with HandSmoothers, the gestures are smoothed per hand. With top_k above
+    1, packet['ranked'] also holds the top_k unsmoothed labels per hand, as
+    returned by decode_prediction.
+    With a LoopMetrics, every step is timed; overlay=True also draws the
+    metrics onto the frame.
+    """
+    if gate is None:
+        gate = MotionGate(epsilon=0)
+    if smoother is None:
+        smoother = HandSmoothers(window=1, method='majority')
+    if metrics is None:
+        metrics = LoopMetrics(enabled=False)
+    # Frames are in flight in several stages at once, so no shared buffers here
+    processor = make_frame_processor(reuse_buffers=False, metrics=metrics)
+
+    def read_frame():
+        # Generous timeout: a freshly opened camera can be slow to deliver its first frame
+        ret, frame = cap.read(timeout=3.0)
+        return frame if ret else None
+
+    def extract_landmarks(packet):
+        # Buffers are not reused here, so dropping the last frame's costs nothing and
+        # processor.rgb stays None when preprocessing fails before the conversion
+        processor.rgb = None
+        packet['landmarks'], packet['hand_landmarks'] = preprocess_frame(packet['frame'], processor)
+        packet['rgb'] = (
+            processor.rgb if processor.rgb is not None else cv2.cvtColor(packet['frame'], cv2.COLOR_BGR2RGB)
+        )
+        packet['handedness'] = processor.handedness
+        return packet
+
+    def predict_probabilities(landmarks):
+        with metrics.timer('predict'):
+            return predictor.predict(landmarks)
+
+    def classify(packet):
+        packet['cached'] = False
+        if packet['landmarks'] is None:
+            gate.reset()
+            smoother.reset()
+        else:
+            probabilities = gate(packet['landmarks'], predict_probabilities)
+            packet['cached'] = gate.last_hit
+            with metrics.timer('decode'):
+                smoothed = smoother.update(packet['handedness'], probabilities)
+                packet['hands'] = [
+                    (hand, gesture_classes[index], confidence)
+                    for hand, (index, confidence) in zip(packet['handedness'], smoothed)
+                ]
+                _, packet['gesture'], packet['confidence'] = packet['hands'][0]
+                if top_k > 1:
+                    packet['ranked'] = decode_prediction(probabilities, packet['handedness'], top_k)
+        return packet
+
+    def render(packet):
+        if packet['landmarks'] is not None:
+            with metrics.timer('draw_landmarks'):
+                draw_landmarks(packet['rgb'], packet['hand_landmarks'], rgb=True)
+            with metrics.timer('putText'):
+                for i, (hand, gesture, confidence) in enumerate(packet['hands']):
+                    cv2.putText(
+                        packet['rgb'],
+                        f"{hand}: {gesture} ({confidence:.2%})",
+                        (10, 30 + 35 * i),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        1,
+                        (0, 255, 0),
+                        2
+                    )
+        if overlay:
+            # Below the gesture labels, one line per hand
+            hands = len(packet['hands']) if packet['landmarks'] is not None else 1
+            metrics.draw_overlay(packet['rgb'], origin=(10, 25 + 35 * hands))
+        return packet
+
+    stages = [Stage('landmarks', extract_landmarks), Stage('classify', classify), Stage('render', render)]
+    return FramePipeline(read_frame, stages, queue_size=1, thread_hook=add_script_run_ctx)
+
+def analyze_uploaded_video(uploaded_file, predictor, progress=None):
+    """
+    Run video_analysis.analyze_video on a Streamlit upload, or the
+    multi-process analyze_video_parallel for long recordings.
+    OpenCV needs a path, so the upload is spooled to a temporary file first.
+    """
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        uploaded_file.seek(0)
+        shutil.copyfileobj(uploaded_file, tmp)
+    cache = LandmarkCache(**LANDMARK_CACHE)
+    try:
+        frame_count, _ = video_analysis.video_info(tmp.name)
+        if VIDEO_ANALYSIS['workers'] > 1 and frame_count >= VIDEO_ANALYSIS['parallel_min_frames']:
+            # Each worker process loads its own model, so the shared predictor is not used here
+            return video_analysis.analyze_video_parallel(
+                tmp.name,
+                workers=VIDEO_ANALYSIS['workers'],
+                overlap=VIDEO_ANALYSIS['overlap'],
+                model_path=MODEL_PATH,
+                batch_size=VIDEO_ANALYSIS['batch_size'],
+                progress=progress,
+                cache=cache,
+            )
+        return video_analysis.analyze_video(
+            tmp.name, predictor, batch_size=VIDEO_ANALYSIS['batch_size'], progress=progress, cache=cache
+        )
+    finally:
+        os.remove(tmp.name)
+
+def format_pipeline_stats(rows):
+    """Summarise FramePipeline.stats() as one line for the UI."""
+    return " | ".join(
+        f"{row['stage']}: {row['fps']:.1f} fps, queue {row['queue_depth']}, dropped {row['dropped']}"
+        for row in rows
+    )
+
 def initialize_speed_sign_game():
     """Initialize a new speed sign game session."""
     signs = [
@@ -1316,20 +1568,10 @@ if 'game_scores' not in st.session_state:
 if 'advanced_ai_history' not in st.session_state:
     st.session_state.advanced_ai_history = deque(maxlen=10)
 
-# Initialize model
-if 'model' not in st.session_state:
-    try:
-        st.session_state.model = load_model('gesture_recognition_model.h5')
-        st.session_state.model_loaded = True
-    except Exception as e:
-        st.error(f"Error loading model: {str(e)}")
-        st.session_state.model_loaded = False
-
-# Welcome Page
-
+# The gesture model is loaded by get_model() when a camera feature first needs it
 
 # Main Application
-elif st.session_state.page == 'Main':
+if st.session_state.page == 'Main':
     selected = option_menu(
         menu_title=None,
         options=["Tutorials", "Gesture Examples", "Practice Games", "AI Assistant", "Real-time Recognition"],
@@ -1694,17 +1936,22 @@ elif st.session_state.page == 'Main':
             # Single frame placeholder for camera feed
                     frame_placeholder = st.empty()
             
+                    cap = None
                     try:
-                        cap = cv2.VideoCapture(0)
-                        ret, frame = cap.read()
+                        # Shared device: stays open between reruns instead of reopening per frame
+                        cap = capture.camera_manager.acquire(0, **CAMERA_CONFIG)
+                        ret, frame = cap.read(timeout=3.0)
                 
                         if ret:
-                            processed_landmarks, hand_landmarks = preprocess_frame(frame)
+                            processor = frame_processing.FrameProcessor(get_hands())
+                            processed_landmarks, hand_landmarks = preprocess_frame(frame, processor)
+                            # processor.rgb is still unset when preprocessing failed before the conversion
+                            frame = processor.rgb if processor.rgb is not None else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                             if processed_landmarks is not None:
-                                prediction = st.session_state.model.predict(processed_landmarks, verbose=0)
+                                prediction = get_model().predict(processed_landmarks)
                                 current_gesture, confidence = decode_prediction(prediction)
                         
-                                frame = draw_landmarks(frame, hand_landmarks)
+                                frame = draw_landmarks(frame, hand_landmarks, rgb=True)
                                 frame = cv2.putText(
                             frame,
                             f"Detected: {current_gesture} ({confidence:.2%})",
@@ -1720,13 +1967,14 @@ elif st.session_state.page == 'Main':
                                     st.session_state.correct_gestures += 1
                                     st.session_state.current_gesture_index += 1
                             
-                            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                             frame_placeholder.image(frame)
                 
-                        cap.release()
-                
                     except Exception as e:
                         st.error(f"Error accessing camera: {str(e)}")
+                    finally:
+                        # Also on errors, or the shared device is never handed back to the manager
+                        if cap is not None:
+                            cap.release()
             
                     if st.button("Skip Gesture"):
                         st.session_state.current_gesture_index += 1
@@ -1962,52 +2210,83 @@ function setSelectedModel(modelName) {
                 if uploaded_file is not None:
                     st.video(uploaded_file)
                     if st.button("Analyze Video"):
-                        with st.spinner("Analyzing your signing..."):
-                            time.sleep(2)  # Simulate processing
-                            st.write("Analysis Results:")
-                            st.write("- Hand positioning: Good")
-                            st.write("- Sign clarity: 85%")
-                            st.write("- Speed: Appropriate")
-                            st.write("- Areas for improvement: Hand transitions could be smoother")
+                        model = get_model()
+                        if model is not None:
+                            progress_bar = st.progress(0.0, text="Analyzing your signing...")
+                            try:
+                                analysis = analyze_uploaded_video(
+                                    uploaded_file,
+                                    model,
+                                    progress=lambda done, total: progress_bar.progress(
+                                        min(done / total, 1.0), text=f"Analyzing your signing... {done}/{total} frames"
+                                    )
+                                )
+                            except Exception as e:
+                                st.error(f"Error analyzing video: {str(e)}")
+                            else:
+                                stats = analysis.stats
+                                st.write("Analysis Results:")
+                                st.write(f"- Frames analyzed: {stats['frames']} ({stats['hand_frames']} with a hand)")
+                                st.write(f"- Throughput: {stats['fps']:.1f} frames/sec ({stats['seconds']:.1f} s)")
+                                if stats['cached']:
+                                    st.write("- Hand landmarks reused from an earlier analysis of this video")
+
+                                segments = analysis.segments(gesture_classes, VIDEO_ANALYSIS['min_frames'])
+                                if segments:
+                                    st.dataframe(pd.DataFrame(segments), use_container_width=True)
+                                    timeline = pd.DataFrame(analysis.timeline(gesture_classes))
+                                    st.line_chart(timeline.set_index('time')['confidence'])
+                                else:
+                                    st.info("No hand detected in the video.")
             
             else:  # Live Camera
                 st.write("Position yourself in front of the camera and perform signs for real-time analysis.")
                 if st.button("Start Analysis"):
-                    if st.session_state.model_loaded:
+                    model = get_model()
+                    if model is not None:
+                        cap = None
                         try:
-                            cap = cv2.VideoCapture(0)
+                            cap = capture.camera_manager.acquire(0, **CAMERA_CONFIG)
                             analysis_placeholder = st.empty()
+                            processor = make_frame_processor()
+                            gate = MotionGate(**MOTION_GATE)
                             
                             while True:
-                                ret, frame = cap.read()
+                                # Generous timeout: a freshly opened camera can be slow to deliver its first frame
+                                ret, frame = cap.read(timeout=3.0)
                                 if not ret:
                                     break
                                     
-                                processed_landmarks, hand_landmarks = preprocess_frame(frame)
-                                if processed_landmarks is not None:
-                                    prediction = st.session_state.model.predict(processed_landmarks, verbose=0)
-                                    current_gesture, confidence = decode_prediction(prediction)
+                                processed_landmarks, hand_landmarks = preprocess_frame(frame, processor)
+                                if processed_landmarks is None:
+                                    gate.reset()
+                                else:
+                                    # All hands in one model call; the gate reuses probabilities only,
+                                    # so every frame is decoded with its own handedness
+                                    probabilities = gate(processed_landmarks, model.predict)
+                                    detected = decode_prediction(probabilities, processor.handedness)
                                     
                                     # Advanced analysis metrics
-                                    frame = draw_landmarks(frame, hand_landmarks)
-                                    analysis_text = f"""
-                                    Detected Gesture: {current_gesture}
+                                    frame = draw_landmarks(processor.rgb, hand_landmarks, rgb=True)
+                                    analysis_text = "".join(f"""
+                                    {hand} Hand Gesture: {current_gesture}
                                     Confidence: {confidence:.2%}
                                     Hand Stability: {'Good' if confidence > 0.8 else 'Needs Improvement'}
                                     Speed: {'Appropriate' if confidence > 0.7 else 'Too Fast/Slow'}
-                                    """
+                                    """ for hand, current_gesture, confidence in detected)
                                     
-                                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                                     analysis_placeholder.image(frame)
                                     st.write(analysis_text)
                                 
                                 if not st.session_state.camera_on:
                                     break
                             
-                            cap.release()
-                            
                         except Exception as e:
                             st.error(f"Error during analysis: {str(e)}")
+                        finally:
+                            # Also runs on errors and when Streamlit interrupts the loop for a rerun
+                            if cap is not None:
+                                cap.release()
                     else:
                         st.error("Advanced analysis model not loaded. Please check system configuration.")
     
@@ -2153,67 +2432,116 @@ function setSelectedModel(modelName) {
             prediction_placeholder = st.markdown('<div class="prediction-box"></div>', unsafe_allow_html=True)
             confidence_placeholder = st.empty()
         
-            if st.session_state.camera_on and st.session_state.model_loaded:
+            model = get_model() if st.session_state.camera_on else None
+            if model is not None:
+                cap = pipeline = publisher = None
                 try:
-                    cap = cv2.VideoCapture(0)
+                    cap = capture.camera_manager.acquire(0, **CAMERA_CONFIG)
+                    gate = MotionGate(**MOTION_GATE)
+                    smoother = HandSmoothers(**PREDICTION_SMOOTHING)
+                    display = PredictionDisplay(**PREDICTION_DISPLAY)
+                    metrics = LoopMetrics(enabled=INSTRUMENTATION['enabled'])
+                    if metrics.enabled and INSTRUMENTATION['port']:
+                        serve_metrics(metrics, INSTRUMENTATION['port'])
+                    metrics_placeholder = (
+                        st.sidebar.empty() if metrics.enabled and INSTRUMENTATION['overlay'] == 'sidebar' else None
+                    )
+                    pipeline = build_recognition_pipeline(
+                        cap, model, gate, smoother, metrics,
+                        overlay=metrics.enabled and INSTRUMENTATION['overlay'] == 'frame',
+                        top_k=PREDICTION_TOP_K,
+                    ).start()
+                    publisher = video_publisher.VideoPublisher(
+                        frame_placeholder, thread_hook=add_script_run_ctx, metrics=metrics, **VIDEO_PUBLISHER
+                    ).start()
+                    stats_placeholder = st.empty()
+                    last_stats_update = time.time()
                 
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if not ret:
-                            st.error("Failed to grab frame")
-                            break
+                    while pipeline.running:
+                        packet = pipeline.get(timeout=1.0)
+                        if packet is None:
+                            if not pipeline.running:
+                                st.error("Failed to grab frame")
+                            continue
                     
-                        processed_landmarks, hand_landmarks = preprocess_frame(frame)
+                        # RGB copy made once by the landmark stage, shared with the display
+                        frame = packet['rgb']
+                        metrics.frame(packet['landmarks'] is not None)
                     
-                        if processed_landmarks is not None:
-                            prediction = st.session_state.model.predict(processed_landmarks, verbose=0)
-                            current_pred, current_conf = decode_prediction(prediction)
-                        
-                            frame = draw_landmarks(frame, hand_landmarks)
-                            frame = cv2.putText(
-                            frame,
-                            f"{current_pred} ({current_conf:.2%})",
-                            (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            1,
-                            (0, 255, 0),
-                            2
-                        )
+                        if packet['landmarks'] is not None:
+                            current_pred, current_conf = packet['gesture'], packet['confidence']
+                            hands = packet['hands']
                         
-                        # Update prediction display with animation
-                            prediction_placeholder.markdown(f"""
-                            <div class="prediction-box">
-                                <h3>Current Prediction:</h3>
-                                <h2 style="color: #00FF9D;">{current_pred}</h2>
+                        # Update prediction display only when a label or confidence bucket changes
+                            if display.should_update(
+                                tuple((hand, gesture) for hand, gesture, _ in hands),
+                                [confidence for _, _, confidence in hands],
+                            ):
+                                # Runner-up labels per hand, when the backend ranks them (PREDICTION_TOP_K)
+                                ranked = packet.get('ranked') or [(hand, [], []) for hand, _, _ in hands]
+                                alternatives = [
+                                    ", ".join(f"{label} ({score:.0%})" for label, score in zip(labels, scores) if label != gesture)
+                                    for (_, gesture, _), (_, labels, scores) in zip(hands, ranked)
+                                ]
+                                predictions = "".join(f"""
+                                <h2 style="color: #00FF9D;">{f"{hand}: " if len(hands) > 1 else ""}{gesture}</h2>
                                 <div class="confidence-bar">
-                                    <div class="confidence-fill" style="width: {current_conf*100}%;"></div>
+                                    <div class="confidence-fill" style="width: {display.bucket(confidence)*100:.0f}%;"></div>
                                 </div>
-                                <p>Confidence: {current_conf:.2%}</p>
+                                <p>Confidence: {display.bucket(confidence):.0%}</p>{f"<p>Also close: {others}</p>" if others else ""}"""
+                                for (hand, gesture, confidence), others in zip(hands, alternatives))
+                                prediction_placeholder.markdown(f"""
+                            <div class="prediction-box">
+                                <h3>Current Prediction:</h3>{predictions}
                             </div>
                         """, unsafe_allow_html=True)
                         
-                            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            frame_placeholder.image(frame)
+                            publisher.submit(frame)
                         
                             st.session_state.current_pred = current_pred
                             st.session_state.current_conf = current_conf
                         else:
-                            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            frame_placeholder.image(frame)
-                            prediction_placeholder.markdown("""
+                            publisher.submit(frame)
+                            if display.should_update(None):
+                                prediction_placeholder.markdown("""
                             <div class="prediction-box" style="border-color: #FF4444;">
                                 <h3>No Hand Detected</h3>
                                 <p>Please show your hand in the camera view</p>
                             </div>
                         """, unsafe_allow_html=True)
+
+                        # Per-stage throughput and queue depth, refreshed once a second
+                        if time.time() - last_stats_update >= 1.0:
+                            video_stats = publisher.stats()
+                            stats_placeholder.caption(
+                                f"{format_pipeline_stats(pipeline.stats())} | "
+                                f"motion gate: {gate.hit_rate:.0%} of predictions reused | "
+                                f"prediction box: {display.messages_per_second:.1f} msg/s | "
+                                f"video: {video_stats['publish_fps']:.1f} fps, "
+                                f"{video_stats['kbytes_per_second']:.0f} KB/s"
+                            )
+                            if metrics.enabled:
+                                metrics.set_dropped('camera', cap.stats()['frames_dropped'])
+                                metrics.set_dropped('pipeline', sum(row['dropped'] for row in pipeline.stats()))
+                                if metrics_placeholder is not None:
+                                    metrics_placeholder.code('\n'.join(metrics.overlay_lines()))
+                                if INSTRUMENTATION['textfile']:
+                                    metrics.write_textfile(INSTRUMENTATION['textfile'])
+                            last_stats_update = time.time()
                     
                         if not st.session_state.camera_on:
                             break
-                
-                    cap.release()
             
                 except Exception as e:
                     st.error(f"Error accessing camera: {str(e)}")
+                finally:
+                    # Also runs when Streamlit interrupts the loop for a rerun
+                    if pipeline is not None:
+                        pipeline.stop()
+                    if publisher is not None:
+                        publisher.stop()
+                    if cap is not None:
+                        cap.release()
         
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,57 @@
+import itertools
+
+import numpy as np
+
+WRIST = 0
+# Middle finger MCP: wrist to this joint is the palm size used for scaling
+PALM_LANDMARK = 9
+FINGERTIPS = (4, 8, 12, 16, 20)
+FINGERTIP_PAIRS = np.array(list(itertools.combinations(FINGERTIPS, 2)))
+
+# 20 wrist-relative landmarks x (x, y, z), then the 10 fingertip distances
+FEATURE_SIZE = 20 * 3 + len(FINGERTIP_PAIRS)
+
+
+def canonical_features(landmarks):
+    """
+    Position- and size-invariant features for a batch of hands.
+
+    landmarks is anything reshapeable to (n, 21, 3) (e.g. the (1, 21, 3, 1)
+    model input). Every landmark is taken relative to the wrist and divided
+    by the palm size (wrist to middle finger MCP in x/y), so the same pose
+    gives the same features anywhere in the frame and at any distance from
+    the camera. The wrist itself (always zero) is dropped and the pairwise
+    fingertip distances are appended. Returns (n, FEATURE_SIZE) float32.
+    """
+    points = np.asarray(landmarks, dtype=np.float32).reshape((-1, 21, 3))
+    relative = points[:, 1:] - points[:, WRIST:WRIST + 1]
+    palm = relative[:, PALM_LANDMARK - 1, :2]
+    size = np.sqrt(np.sum(palm * palm, axis=-1))
+    relative /= np.maximum(size, 1e-6)[:, None, None]
+    # Fingertip indices shift by one with the wrist dropped
+    tips = relative[:, FINGERTIP_PAIRS[:, 0] - 1] - relative[:, FINGERTIP_PAIRS[:, 1] - 1]
+    distances = np.sqrt(np.sum(tips * tips, axis=-1))
+    return np.concatenate([relative.reshape(len(points), -1), distances], axis=1)
+
+
+def canonical_features_tf(landmarks):
+    """
+    canonical_features as TensorFlow ops, for tf.data pipelines and traced models.
+    """
+    import tensorflow as tf
+
+    points = tf.reshape(tf.cast(landmarks, tf.float32), [-1, 21, 3])
+    relative = points[:, 1:] - points[:, WRIST:WRIST + 1]
+    palm = relative[:, PALM_LANDMARK - 1, :2]
+    size = tf.sqrt(tf.reduce_sum(palm * palm, axis=-1))
+    relative /= tf.maximum(size, 1e-6)[:, None, None]
+    tips = tf.gather(relative, FINGERTIP_PAIRS[:, 0] - 1, axis=1) - tf.gather(relative, FINGERTIP_PAIRS[:, 1] - 1, axis=1)
+    distances = tf.sqrt(tf.reduce_sum(tips * tips, axis=-1))
+    return tf.concat([tf.reshape(relative, [-1, 20 * 3]), distances], axis=1)
+
+
+def uses_features(input_shape):
+    """
+    Whether a model with this input shape (without the batch axis) takes canonical features.
+    """
+    return tuple(input_shape) == (FEATURE_SIZE,)
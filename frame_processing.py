@@ -0,0 +1,279 @@
+import dataclasses
+from functools import lru_cache
+from types import MappingProxyType
+
+import cv2
+import numpy as np
+
+from inference import LANDMARK_SHAPE
+from metrics import DISABLED
+
+# MediaPipe Hands settings shared (read-only) by every stream in the process.
+# Hands instances themselves are stateful trackers and must not be shared.
+HANDS_CONFIG = MappingProxyType(dict(
+    static_image_mode=False,
+    max_num_hands=1,
+    min_detection_confidence=0.5,
+    min_tracking_confidence=0.5,
+))
+# Second tracker for FrameProcessor(two_hands=...)
+TWO_HANDS_CONFIG = MappingProxyType(dict(HANDS_CONFIG, max_num_hands=2))
+
+# MediaPipe labels handedness as seen in a mirrored (selfie) image
+_SWAPPED_HANDEDNESS = {'Left': 'Right', 'Right': 'Left'}
+
+
+class FrameProcessor:
+    """
+    Per-stream frame processing with reusable buffers.
+
+    One instance belongs to one camera/video stream. Each frame is converted
+    BGR->RGB once into a preallocated buffer that is shared by MediaPipe and
+    the display, and the landmarks are written in place into a (n, 21, 3, 1)
+    float32 tensor, one row per hand. Both buffers are overwritten by the
+    next call to process().
+
+    With reuse_buffers=False every frame gets fresh buffers instead, for
+    pipelines where several frames are in flight at once.
+
+    `hands` tracks a single hand. To recognize up to two, also pass a Hands
+    instance created with TWO_HANDS_CONFIG as `two_hands`. MediaPipe set up
+    for two hands runs palm detection on every frame until it has found
+    both, which about doubles the cost of frames with one hand, so it only
+    runs every `search_interval` frames to look for a second hand, and on
+    every frame while it is tracking two. Passing the same TWO_HANDS_CONFIG
+    instance as both runs it on every frame. The rows of the landmark tensor
+    are ordered by `handedness`, the signer's 'Left' / 'Right' per hand;
+    MediaPipe's labels are swapped back unless the frames are `mirrored`.
+
+    Pass a metrics.LoopMetrics to time the cvtColor, hands.process and
+    landmarks steps of every frame.
+    """
+
+    def __init__(self, hands, reuse_buffers=True, metrics=None, two_hands=None, search_interval=5, mirrored=False):
+        self.hands = hands
+        self.reuse_buffers = reuse_buffers
+        self.metrics = metrics or DISABLED
+        self.two_hands = two_hands
+        self.search_interval = search_interval
+        self.mirrored = mirrored
+        self.max_hands = 1 if two_hands is None else 2
+        self.landmarks = np.zeros((self.max_hands,) + LANDMARK_SHAPE, dtype=np.float32)
+        self._coords = self.landmarks.reshape(-1)
+        self.rgb = None
+        self.results = None
+        self.handedness = ()
+        self.tracking_two = False
+        self.frames_since_search = 0
+
+    def to_rgb(self, frame):
+        """
+        Convert a BGR frame into the reusable RGB buffer.
+        """
+        if not self.reuse_buffers or self.rgb is None or self.rgb.shape != frame.shape:
+            self.rgb = np.empty_like(frame)
+        self.rgb.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return self.rgb
+
+    def process(self, frame):
+        """
+        Detect the hands in a BGR frame.
+        Returns (landmarks, multi_hand_landmarks) or (None, None) when no hand is found.
+        """
+        with self.metrics.timer('cvtColor'):
+            rgb = self.to_rgb(frame)
+
+        # MediaPipe takes a reference to read-only arrays instead of copying them
+        rgb.flags.writeable = False
+        with self.metrics.timer('hands.process'):
+            self.results = self._detect(rgb)
+        rgb.flags.writeable = True
+
+        if not self.results.multi_hand_landmarks:
+            self.handedness = ()
+            return None, None
+        with self.metrics.timer('landmarks'):
+            hand_landmarks = self._order_hands(self.results)
+            landmarks = self.fill_hands(hand_landmarks)
+        return landmarks, hand_landmarks
+
+    def _detect(self, rgb):
+        if self.two_hands is None or self.two_hands is self.hands:
+            return self.hands.process(rgb)
+        # With no hand in view the one-hand tracker is already running palm detection on every frame
+        search = self.tracking_two or (self.handedness and self.frames_since_search >= self.search_interval)
+        self.frames_since_search = 0 if search else self.frames_since_search + 1
+        trackers = (self.two_hands, self.hands) if search else (self.hands, self.two_hands)
+        for tracker in trackers:
+            results = tracker.process(rgb)
+            if tracker is self.two_hands:
+                self.tracking_two = len(results.multi_hand_landmarks or ()) == 2
+            # Each tracker's state goes stale while the other one runs: when the first loses
+            # the hand of the previous frame, the other one may still have it
+            if results.multi_hand_landmarks or not self.handedness:
+                return results
+        return results
+
+    def _order_hands(self, results):
+        """
+        The detected hands sorted Left first, setting self.handedness to match.
+        Hands with the same label are ordered by their wrist's x in the image.
+        """
+        hands = results.multi_hand_landmarks[:self.max_hands]
+        labels = [handedness.classification[0].label for handedness in results.multi_handedness or ()]
+        if len(labels) < len(hands):
+            labels = [''] * len(hands)
+        if not self.mirrored:
+            labels = [_SWAPPED_HANDEDNESS.get(label, label) for label in labels]
+        order = sorted(range(len(hands)), key=lambda i: (labels[i], hands[i].landmark[0].x))
+        self.handedness = tuple(labels[i] for i in order)
+        return [hands[i] for i in order]
+
+    def fill_hands(self, hand_landmarks):
+        """
+        Write each hand's landmarks into one row of the (n, 21, 3, 1) model input tensor.
+        """
+        if not self.reuse_buffers:
+            self.landmarks = np.empty((self.max_hands,) + LANDMARK_SHAPE, dtype=np.float32)
+            self._coords = self.landmarks.reshape(-1)
+        coords = self._coords
+        j = 0
+        for hand in hand_landmarks:
+            for landmark in hand.landmark:
+                coords[j] = landmark.x
+                coords[j + 1] = landmark.y
+                coords[j + 2] = landmark.z
+                j += 3
+        return self.landmarks[:len(hand_landmarks)]
+
+
+class HandTracker(FrameProcessor):
+    """
+    FrameProcessor that only looks where the hand was on the previous frame.
+
+    After a detection, the next frame is cropped to the landmarks' bounding
+    box (squared, padded by `margin` of its size on each side), downsized so
+    its longer side is at most `max_crop` pixels and passed to MediaPipe on
+    its own. The landmarks are mapped back to full-frame normalized
+    coordinates, so callers and draw_landmarks see the same values as with
+    FrameProcessor. When the crop holds no hand, the same frame is scanned
+    in full and tracking restarts from there. Each tracker is reset when
+    it takes over, so neither follows a hand from before the switch.
+
+    Crops go to their own Hands instance (`roi_hands`, by default a new one
+    with HANDS_CONFIG) so MediaPipe's frame-to-frame tracking stays in crop
+    coordinates; sharing one instance loses the hand on every switch. The
+    crop follows a single hand, so there is no two-hand mode here.
+    """
+
+    def __init__(self, hands, reuse_buffers=True, margin=1.0, max_crop=256, roi_hands=None, metrics=None,
+                 mirrored=False):
+        super().__init__(hands, reuse_buffers, metrics, mirrored=mirrored)
+        if roi_hands is None:
+            import mediapipe as mp
+            roi_hands = mp.solutions.hands.Hands(**HANDS_CONFIG)
+        self.roi_hands = roi_hands
+        self.margin = margin
+        self.max_crop = max_crop
+        self.roi = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.lost = 0
+
+    def process(self, frame):
+        """
+        Detect a hand in a BGR frame, in the tracked region when there is one.
+        Returns (landmarks, multi_hand_landmarks) or (None, None) when no hand is found.
+        """
+        with self.metrics.timer('cvtColor'):
+            rgb = self.to_rgb(frame)
+        rgb.flags.writeable = False
+
+        results = None
+        with self.metrics.timer('hands.process'):
+            if self.roi is not None:
+                results = self._process_roi(rgb, self.roi)
+                if results.multi_hand_landmarks:
+                    self.roi_frames += 1
+                else:
+                    results = None
+                    self.lost += 1
+                    # The full-frame tracker last saw the hand before the crops took over
+                    self.hands.reset()
+            if results is None:
+                results = self.hands.process(rgb)
+                self.full_frames += 1
+
+        rgb.flags.writeable = True
+        self.results = results
+
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            self.handedness = ()
+            return None, None
+
+        with self.metrics.timer('landmarks'):
+            hand_landmarks = self._order_hands(results)
+            landmarks = self.fill_hands(hand_landmarks)
+        tracking = self.roi is not None
+        self.roi = self._next_roi(hand_landmarks[0], rgb.shape)
+        if self.roi is not None and not tracking:
+            # New crops: the ROI tracker's state belongs to the previous, unrelated crop
+            self.roi_hands.reset()
+        return landmarks, hand_landmarks
+
+    def _process_roi(self, rgb, roi):
+        x0, y0, x1, y1 = roi
+        crop = rgb[y0:y1, x0:x1]
+        scale = self.max_crop / max(crop.shape[:2])
+        if scale < 1:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            crop = np.ascontiguousarray(crop)
+        crop.flags.writeable = False
+        results = self.roi_hands.process(crop)
+
+        # Crop-normalized -> frame-normalized; z shares the x scale in MediaPipe
+        height, width = rgb.shape[:2]
+        sx, sy = (x1 - x0) / width, (y1 - y0) / height
+        ox, oy = x0 / width, y0 / height
+        for hand_landmarks in results.multi_hand_landmarks or ():
+            for landmark in hand_landmarks.landmark:
+                landmark.x = ox + landmark.x * sx
+                landmark.y = oy + landmark.y * sy
+                landmark.z *= sx
+        return results
+
+    def _next_roi(self, hand_landmarks, shape):
+        """
+        Square pixel box (x0, y0, x1, y1) around the landmarks, clipped to the frame.
+        """
+        height, width = shape[:2]
+        xs = [landmark.x * width for landmark in hand_landmarks.landmark]
+        ys = [landmark.y * height for landmark in hand_landmarks.landmark]
+        cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        half = max(max(xs) - min(xs), max(ys) - min(ys)) * (0.5 + self.margin)
+        x0, x1 = max(int(cx - half), 0), min(int(cx + half), width)
+        y0, y1 = max(int(cy - half), 0), min(int(cy + half), height)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+
+
+@lru_cache(maxsize=None)
+def rgb_hand_styles():
+    """
+    MediaPipe's default hand drawing styles with colours swapped for RGB frames.
+    The defaults are BGR, which would render red and blue inverted on processor.rgb.
+    """
+    import mediapipe as mp
+
+    styles = mp.solutions.drawing_styles
+
+    def swap(spec):
+        return dataclasses.replace(spec, color=tuple(reversed(spec.color)))
+
+    landmark_style = {k: swap(v) for k, v in styles.get_default_hand_landmarks_style().items()}
+    connection_style = {k: swap(v) for k, v in styles.get_default_hand_connections_style().items()}
+    return landmark_style, connection_style
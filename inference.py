@@ -0,0 +1,149 @@
+import os
+import pickle
+import threading
+
+import numpy as np
+
+MODEL_PATH = os.environ.get('GESTURE_MODEL', 'gesture_recognition_model.h5')
+MLP_MODEL_PATH = 'gesture_mlp_model.h5'
+LABEL_MAP_PATH = 'label_map.pkl'
+
+# Runtime backends: 'keras' traces the model with TensorFlow, 'numpy' runs the
+# forward pass in NumPy and never imports TensorFlow, 'tflite' runs a .tflite
+# export from quantize.py on TFLITE_THREADS interpreter threads, 'knn' looks the
+# hand up in the nearest-neighbour index kept next to the model (knn_model.py).
+BACKENDS = ('keras', 'numpy', 'tflite', 'knn')
+DEFAULT_BACKEND = os.environ.get('GESTURE_BACKEND', 'keras')
+TFLITE_THREADS = int(os.environ.get('GESTURE_TFLITE_THREADS', '1'))
+
+# Landmark tensor layout expected by the CNN: 21 landmarks x (x, y, z) x 1 channel
+LANDMARK_SHAPE = (21, 3, 1)
+
+
+class GesturePredictor:
+    """
+    Low-overhead inference wrapper for the gesture model.
+
+    model.predict builds a data adapter and runs a full predict loop on every
+    call, which dominates the cost of a single (1, 21, 3, 1) sample. Here the
+    forward pass is traced once into a tf.function and warmed up at load time,
+    so each live frame only pays for the graph execution itself.
+
+    Models whose input is the canonical feature vector (the MLP tier) get
+    features.canonical_features_tf traced into the same graph, so callers
+    always pass raw landmarks.
+    """
+
+    def __init__(self, model, warmup_runs=3):
+        import tensorflow as tf
+
+        from features import canonical_features_tf, uses_features
+
+        self.model = model
+        if uses_features(model.input_shape[1:]):
+            forward = lambda x: model(canonical_features_tf(x), training=False)
+        else:
+            forward = lambda x: model(x, training=False)
+        self._forward = tf.function(
+            forward,
+            input_signature=[tf.TensorSpec((None,) + LANDMARK_SHAPE, tf.float32)],
+        )
+        self.warmup(warmup_runs)
+
+    def warmup(self, runs=3):
+        """
+        Run the traced forward pass a few times so the first camera frame
+        does not pay for tracing and kernel initialisation.
+        """
+        dummy = np.zeros((1,) + LANDMARK_SHAPE, dtype=np.float32)
+        for _ in range(runs):
+            self._forward(dummy)
+
+    def predict(self, landmarks):
+        """
+        Return class probabilities with shape (batch, num_classes).
+        Accepts the (1, 21, 3, 1) array produced by preprocess_frame.
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape((-1,) + LANDMARK_SHAPE)
+        return self._forward(landmarks).numpy()
+
+    __call__ = predict
+
+
+def load_predictor(path=MODEL_PATH, backend=None, warmup_runs=3):
+    """
+    Load the gesture model for the selected backend.
+
+    The backend defaults to the GESTURE_BACKEND environment variable
+    ('keras' when unset). All backends expose the same predict() method;
+    'tflite' expects a .tflite file, 'knn' the index itself or the model it
+    was built next to.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'keras':
+        from tensorflow.keras.models import load_model
+
+        return GesturePredictor(load_model(path), warmup_runs=warmup_runs)
+    if backend == 'numpy':
+        from numpy_model import NumpyGestureModel
+
+        return NumpyGestureModel.from_h5(path)
+    if backend == 'tflite':
+        from tflite_model import TFLiteGestureModel
+
+        return TFLiteGestureModel(path, num_threads=TFLITE_THREADS)
+    if backend == 'knn':
+        from knn_model import KNNGestureModel, knn_path
+
+        return KNNGestureModel.load(path if path.endswith('.knn.pkl') else knn_path(path))
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+
+class SharedPredictor:
+    """
+    Thread-safe wrapper for a predictor shared by every Streamlit session.
+    Inference calls are serialised; a single frame takes well under a
+    millisecond, so the lock is never the bottleneck.
+    """
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self._lock = threading.Lock()
+
+    def predict(self, landmarks):
+        with self._lock:
+            return self.predictor.predict(landmarks)
+
+    __call__ = predict
+
+
+_shared_lock = threading.Lock()
+_shared_predictors = {}
+_shared_label_maps = {}
+
+
+def get_shared_predictor(path=MODEL_PATH, backend=None):
+    """
+    Return the process-wide SharedPredictor for (path, backend), loading it on first use.
+    Streamlit re-runs the script per session, but imported modules live for the
+    whole process, so every session gets the same model instead of its own copy.
+    """
+    key = (os.path.abspath(path), backend or DEFAULT_BACKEND)
+    with _shared_lock:
+        if key not in _shared_predictors:
+            _shared_predictors[key] = SharedPredictor(load_predictor(path, backend=key[1]))
+        return _shared_predictors[key]
+
+
+def get_gesture_classes(path=LABEL_MAP_PATH):
+    """
+    Class names ordered by model output index, read once per process from label_map.pkl.
+    Returns a tuple so sessions cannot modify the shared copy.
+    """
+    key = os.path.abspath(path)
+    with _shared_lock:
+        if key not in _shared_label_maps:
+            with open(path, 'rb') as f:
+                label_map = pickle.load(f)
+            _shared_label_maps[key] = tuple(str(label_map[i]) for i in sorted(label_map))
+        return _shared_label_maps[key]
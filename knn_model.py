@@ -0,0 +1,126 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from features import canonical_features
+from inference import MODEL_PATH
+
+KNN_VERSION = 2
+
+
+def knn_path(model_path):
+    """
+    Where the nearest-neighbour index for a model lives: next to it, e.g.
+    gesture_recognition_model.h5 -> gesture_recognition_model.knn.pkl.
+    """
+    return os.path.splitext(model_path)[0] + '.knn.pkl'
+
+
+class KNNGestureModel:
+    """
+    k-nearest-neighbour gesture classifier over canonical landmark features.
+
+    The training hands are indexed in a scipy cKDTree. predict() looks up the
+    k closest ones and returns a (batch, num_classes) score per class, the
+    inverse-distance-weighted share of the neighbours with that label, so
+    decode_prediction and every other consumer of model output works
+    unchanged; a query that lands exactly on a training hand scores 1.0.
+    Scores are relative to the neighbours found, not calibrated
+    probabilities: a hand unlike anything in the index still gets a winner.
+
+    Building needs the landmark store; loading only needs NumPy and SciPy.
+    """
+
+    def __init__(self, features, class_ids, class_names, k=5):
+        self.features = np.asarray(features, dtype=np.float32)
+        self.class_ids = np.asarray(class_ids, dtype=np.int64)
+        self.class_names = list(class_names)
+        self.k = min(k, len(self.class_ids))
+        self.tree = cKDTree(self.features)
+
+    @classmethod
+    def from_store(cls, store_path, k=5, splits=('train', 'validation'), augment_copies=0, seed=42):
+        """
+        Index the samples of the given splits of a landmark store ('train',
+        'validation', 'test'). The test split is left out by default so it
+        can still measure the index. augment_copies adds that many
+        augment_numpy copies of every sample.
+        """
+        from training_data import load_splits
+
+        store_splits, class_names = load_splits(store_path, seed=seed)
+        parts = [store_splits[split] for split in splits]
+        landmarks = np.concatenate([part[0] for part in parts])
+        class_ids = np.concatenate([part[1] for part in parts])
+        if augment_copies:
+            from augment import augment_numpy
+
+            copies = augment_numpy(np.tile(landmarks, (augment_copies, 1, 1)), seed=seed)
+            landmarks = np.concatenate([landmarks, copies])
+            class_ids = np.tile(class_ids, augment_copies + 1)
+        return cls(canonical_features(landmarks), class_ids, class_names, k=k)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != KNN_VERSION:
+            raise ValueError(f"{path} was written by an incompatible version; rebuild it with knn_model.py")
+        return cls(state['features'], state['class_ids'], state['class_names'], k=state['k'])
+
+    def save(self, path):
+        # Plain arrays only: a pickled cKDTree only loads with the SciPy version that wrote it
+        state = {
+            'version': KNN_VERSION,
+            'features': self.features,
+            'class_ids': self.class_ids,
+            'class_names': self.class_names,
+            'k': self.k,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __len__(self):
+        return len(self.class_ids)
+
+    def predict(self, landmarks):
+        """
+        Return class scores with shape (batch, num_classes).
+        Accepts the (1, 21, 3, 1) array produced by preprocess_frame.
+        """
+        distances, indices = self.tree.query(canonical_features(landmarks), k=self.k)
+        distances = distances.reshape(len(distances), -1)
+        indices = indices.reshape(len(indices), -1)
+        weights = 1.0 / np.maximum(distances, 1e-6)
+        scores = np.zeros((len(indices), len(self.class_names)), dtype=np.float32)
+        np.add.at(scores, (np.arange(len(indices))[:, None], self.class_ids[indices]), weights)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    __call__ = predict
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the nearest-neighbour gesture index from a landmark store.")
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--model', default=MODEL_PATH, help='the index is written next to this model')
+    parser.add_argument('--out', help='index path (default: next to --model)')
+    parser.add_argument('-k', type=int, default=5, help='neighbours per query')
+    parser.add_argument('--augment-copies', type=int, default=0, help='augmented copies of each sample to index')
+    parser.add_argument('--splits', nargs='+', default=['train', 'validation'],
+                        help='store splits to index (default leaves out the test split)')
+    args = parser.parse_args()
+
+    model = KNNGestureModel.from_store(
+        args.store, k=args.k, splits=args.splits, augment_copies=args.augment_copies
+    )
+    path = args.out or knn_path(args.model)
+    model.save(path)
+    print(f"Indexed {len(model)} samples of {len(model.class_names)} labels into {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get('LANDMARK_CACHE_DIR', '.landmark_cache')
+
+
+def _remove(path):
+    # Another process may have evicted the file already
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Content hash of a file, read in chunks so large videos are never fully in memory.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LandmarkCache:
+    """
+    On-disk cache of per-frame hand landmarks extracted from videos.
+
+    Entries are keyed by the video's content hash plus the extraction
+    settings (MediaPipe config, frame range, stride), so the same file under
+    another name hits and a changed setting misses. Each entry is a pair of
+    .npy files, frame indices and (frames, 21, 3) float32 landmarks with NaN
+    rows where no hand was found, read back as read-only memory maps.
+
+    When the entries exceed max_bytes, the least recently used ones are
+    deleted; reading an entry marks it as used (file mtime).
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, path, settings):
+        settings = json.dumps(settings, sort_keys=True, default=str)
+        return f"{file_digest(path)}-{hashlib.blake2b(settings.encode(), digest_size=8).hexdigest()}"
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.frames.npy', base + '.landmarks.npy'
+
+    def get(self, key):
+        """
+        (frame_indices, landmarks) memory maps for a key, or None.
+        """
+        frames_path, landmarks_path = self._paths(key)
+        try:
+            frame_indices = np.load(frames_path, mmap_mode='r')
+            landmarks = np.load(landmarks_path, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            for path in (frames_path, landmarks_path):
+                os.utime(path)
+        except FileNotFoundError:
+            # Evicted since it was opened; the memory maps stay readable
+            pass
+        self.hits += 1
+        return frame_indices, landmarks
+
+    def put(self, key, frame_indices, landmarks):
+        """
+        Store an entry, then evict least recently used entries beyond max_bytes.
+        """
+        for path, array in zip(self._paths(key), (frame_indices, landmarks)):
+            # Write to a temporary file and rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self):
+        """
+        {key: (last_used, bytes)} for every complete entry.
+        Entries missing one of their files (a put that crashed halfway, or one
+        being evicted by another process) are skipped.
+        """
+        files = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith('.npy'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            files.setdefault(name.split('.', 1)[0], []).append(stat)
+        return {
+            key: (max(stat.st_mtime for stat in stats), sum(stat.st_size for stat in stats))
+            for key, stats in files.items()
+            if len(stats) == len(self._paths(key))
+        }
+
+    def size(self):
+        return sum(size for _, size in self.entries().values())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size in entries.values())
+        for key, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                _remove(path)
+            total -= size
+
+    def clear(self):
+        # Every entry file, incomplete ones included
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy'):
+                _remove(os.path.join(self.directory, name))
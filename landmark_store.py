@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+
+FEATURE_SHAPE = (21, 3)
+FEATURES_FILE = 'features.f32'
+LABELS_FILE = 'labels.u16'
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 1
+
+
+class LandmarkStore:
+    """
+    Append-only landmark dataset backed by one contiguous float32 file.
+
+    A store is a directory holding:
+        features.f32  float32 samples back to back, (count, 21, 3) in C order
+        labels.u16    uint16 label id per sample
+        index.json    sample count, feature shape and the label names
+
+    index.json is rewritten last on every append, so readers only ever see
+    the samples it counts even if a writer is interrupted midway.
+    features and label_ids are read-only memory maps sized to that count;
+    labels lists the names that label ids point into.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            index = json.load(f)
+        if index['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported landmark store version {index['version']} in {path!r}")
+        self.count = index['count']
+        self.feature_shape = tuple(index['feature_shape'])
+        self.labels = list(index['labels'])
+        self._features = None
+        self._label_ids = None
+
+    @classmethod
+    def create(cls, path, feature_shape=FEATURE_SHAPE):
+        """
+        Create an empty store at path (a new or empty directory).
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise FileExistsError(f"Landmark store already exists at {path!r}")
+        for name in (FEATURES_FILE, LABELS_FILE):
+            open(os.path.join(path, name), 'wb').close()
+        _write_index(path, dict(version=FORMAT_VERSION, count=0, feature_shape=list(feature_shape), labels=[]))
+        return cls(path)
+
+    @classmethod
+    def open_or_create(cls, path, feature_shape=FEATURE_SHAPE):
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            return cls(path)
+        return cls.create(path, feature_shape)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def features(self):
+        if self._features is None:
+            self._features = self._memmap(FEATURES_FILE, np.float32, (self.count,) + self.feature_shape)
+        return self._features
+
+    @property
+    def label_ids(self):
+        if self._label_ids is None:
+            self._label_ids = self._memmap(LABELS_FILE, np.uint16, (self.count,))
+        return self._label_ids
+
+    def _memmap(self, name, dtype, shape):
+        if not self.count:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode='r', shape=shape)
+
+    def label_id(self, label):
+        """
+        Id of a label name, registering it if it is new.
+        """
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            self.labels.append(label)
+            return len(self.labels) - 1
+
+    def append(self, features, labels):
+        """
+        Append samples: features reshapeable to (n, 21, 3), labels a name per sample or one name for all.
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32).reshape((-1,) + self.feature_shape)
+        if isinstance(labels, str):
+            labels = [labels] * len(features)
+        if len(labels) != len(features):
+            raise ValueError(f"Got {len(features)} samples but {len(labels)} labels")
+        label_ids = np.array([self.label_id(label) for label in labels], dtype=np.uint16)
+
+        # Truncate anything past the committed count left by an interrupted append
+        for name, data, itemsize in (
+            (FEATURES_FILE, features, 4 * int(np.prod(self.feature_shape))),
+            (LABELS_FILE, label_ids, 2),
+        ):
+            with open(os.path.join(self.path, name), 'r+b') as f:
+                f.truncate(self.count * itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(data.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.count += len(features)
+        self._features = self._label_ids = None
+        _write_index(self.path, dict(
+            version=FORMAT_VERSION, count=self.count, feature_shape=list(self.feature_shape), labels=self.labels,
+        ))
+        return len(features)
+
+    def to_arrays(self):
+        """
+        (features as (count, 21, 3, 1) float32, label names as a str array), the notebook's X and y.
+        """
+        features = np.asarray(self.features).reshape((-1,) + self.feature_shape + (1,))
+        return features, np.array(self.labels, dtype=str)[self.label_ids]
+
+
+def _write_index(path, index):
+    tmp_path = os.path.join(path, INDEX_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, os.path.join(path, INDEX_FILE))
+
+
+def read_npy_directory(folder):
+    """
+    The per-sample layout of datacollection.ipynb: (features, labels) from <label>_<n>.npy files.
+    """
+    features, labels = [], []
+    for file in sorted(os.listdir(folder), key=_sample_order):
+        if file.endswith('.npy'):
+            features.append(np.load(os.path.join(folder, file)))
+            labels.append(file.rsplit('_', 1)[0])
+    return np.array(features, dtype=np.float32), labels
+
+
+def _sample_order(file):
+    label, _, number = file.rpartition('_')
+    number = re.sub(r'\D', '', number)
+    return label, int(number) if number else -1
+
+
+def convert_npy_directory(folder, path):
+    """
+    Pack a directory of <label>_<n>.npy samples into a new LandmarkStore at path.
+    Command line: python landmark_store.py sign_language_data1 sign_language_data1.lmstore
+    """
+    features, labels = read_npy_directory(folder)
+    store = LandmarkStore.create(path)
+    store.append(features, labels)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a <label>_<n>.npy sample directory into a landmark store.")
+    parser.add_argument('folder')
+    parser.add_argument('store')
+    args = parser.parse_args()
+    store = convert_npy_directory(args.folder, args.store)
+    print(f"{len(store)} samples, {len(store.labels)} labels -> {args.store}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder module that imports the real one on first attribute access.
+
+    After the first access the real module's namespace is copied in, so later
+    lookups are plain attribute reads with no extra indirection.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Return a module object for `name` that is only imported when first used.
+    Used for the heavy vision stack (OpenCV, MediaPipe, TensorFlow) so that
+    pages without a camera feature never pay for loading it.
+    """
+    return LazyModule(name)
@@ -0,0 +1,251 @@
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class _NullTimer:
+    """
+    Timer handed out while metrics are disabled: entering and leaving it does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class LoopMetrics:
+    """
+    Hot-path instrumentation for the live recognition loop.
+
+    Code under measurement wraps each stage in `with metrics.timer('name'):`
+    and reports every finished frame with frame(hand_detected). Latency
+    percentiles come from the last `window` samples per stage, FPS from the
+    frames of the last `fps_window` seconds; running totals are kept for the
+    Prometheus export. Drop counters are set from the sources that know them
+    (camera, pipeline queues) with set_dropped().
+
+    When disabled, timer() returns a shared no-op context manager and the
+    other calls return immediately, so instrumented code costs one method
+    call per stage. Stages may be timed from several threads.
+    """
+
+    def __init__(self, enabled=True, window=300, fps_window=5.0):
+        self.enabled = enabled
+        self.window = window
+        self.fps_window = fps_window
+        self.frames = 0
+        self.hand_frames = 0
+        self.dropped = {}
+        self._samples = {}
+        self._totals = {}
+        self._frame_times = deque()
+        self._lock = threading.Lock()
+
+    def timer(self, stage):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.window)
+                self._totals[stage] = [0, 0.0]
+            self._samples[stage].append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def frame(self, hand_detected):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self.frames += 1
+            self.hand_frames += bool(hand_detected)
+            self._frame_times.append(now)
+            while self._frame_times[0] < now - self.fps_window:
+                self._frame_times.popleft()
+
+    def set_dropped(self, source, count):
+        if self.enabled:
+            self.dropped[source] = count
+
+    def fps(self):
+        with self._lock:
+            if len(self._frame_times) < 2:
+                return 0.0
+            span = max(time.monotonic() - self._frame_times[0], 1e-9)
+            return len(self._frame_times) / span
+
+    def detection_rate(self):
+        return self.hand_frames / self.frames if self.frames else 0.0
+
+    def stages(self):
+        """
+        {stage: {'p50_ms', 'p95_ms', 'mean_ms', 'count'}} over the recent window.
+        """
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items() if values}
+            counts = {stage: totals[0] for stage, totals in self._totals.items()}
+        return {
+            stage: {
+                'p50_ms': float(np.percentile(values, 50)) * 1e3,
+                'p95_ms': float(np.percentile(values, 95)) * 1e3,
+                'mean_ms': float(values.mean()) * 1e3,
+                'count': counts[stage],
+            }
+            for stage, values in samples.items()
+        }
+
+    def summary(self):
+        return {
+            'fps': self.fps(),
+            'frames': self.frames,
+            'detection_rate': self.detection_rate(),
+            'dropped': dict(self.dropped),
+            'stages': self.stages(),
+        }
+
+    def overlay_lines(self):
+        """
+        Short human-readable lines for an on-frame or sidebar overlay.
+        """
+        lines = [
+            f"{self.fps():.1f} fps | hand {self.detection_rate():.0%} | "
+            f"dropped {sum(self.dropped.values())}"
+        ]
+        for stage, row in self.stages().items():
+            lines.append(f"{stage}: {row['p50_ms']:.1f} / {row['p95_ms']:.1f} ms")
+        return lines
+
+    def draw_overlay(self, frame, origin=(10, 60), color=(255, 255, 0)):
+        """
+        Draw overlay_lines() onto an image in place.
+        """
+        import cv2
+
+        x, y = origin
+        for line in self.overlay_lines():
+            cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1, cv2.LINE_AA)
+            y += 18
+        return frame
+
+    def prometheus_text(self, prefix='gesture_'):
+        """
+        The metrics in Prometheus text exposition format.
+        """
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items() if values}
+            totals = {stage: list(values) for stage, values in self._totals.items()}
+        lines = [
+            f"# HELP {prefix}stage_seconds Time per recognition loop stage (recent window quantiles).",
+            f"# TYPE {prefix}stage_seconds summary",
+        ]
+        for stage, values in samples.items():
+            label = f'stage="{stage}"'
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'{prefix}stage_seconds{{{label},quantile="{quantile}"}} '
+                             f'{np.percentile(values, quantile * 100):.6f}')
+            lines.append(f"{prefix}stage_seconds_sum{{{label}}} {totals[stage][1]:.6f}")
+            lines.append(f"{prefix}stage_seconds_count{{{label}}} {totals[stage][0]}")
+        lines += [
+            f"# HELP {prefix}frames_total Frames processed by the recognition loop.",
+            f"# TYPE {prefix}frames_total counter",
+            f"{prefix}frames_total {self.frames}",
+            f"# HELP {prefix}hand_frames_total Frames in which a hand was detected.",
+            f"# TYPE {prefix}hand_frames_total counter",
+            f"{prefix}hand_frames_total {self.hand_frames}",
+            f"# HELP {prefix}dropped_frames_total Frames dropped, by where they were dropped.",
+            f"# TYPE {prefix}dropped_frames_total counter",
+        ]
+        lines += [f'{prefix}dropped_frames_total{{source="{source}"}} {count}' for source, count in self.dropped.items()]
+        lines += [
+            f"# HELP {prefix}fps Frames per second over the last {self.fps_window:g} s.",
+            f"# TYPE {prefix}fps gauge",
+            f"{prefix}fps {self.fps():.3f}",
+            f"# HELP {prefix}hand_detection_ratio Share of frames with a hand.",
+            f"# TYPE {prefix}hand_detection_ratio gauge",
+            f"{prefix}hand_detection_ratio {self.detection_rate():.4f}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """
+        Write prometheus_text() to path atomically (node_exporter textfile collector style).
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+# Shared instance for code paths that are not instrumented
+DISABLED = LoopMetrics(enabled=False)
+
+_servers_lock = threading.Lock()
+_servers = {}
+
+
+def serve_metrics(metrics, port, host='127.0.0.1'):
+    """
+    Serve metrics.prometheus_text() at http://host:port/metrics from a background thread.
+
+    There is one server per port for the whole process; calling this again
+    (e.g. on a Streamlit rerun) points the running server at the new metrics.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] not in ('/', '/metrics'):
+                        self.send_error(404)
+                        return
+                    body = self.server.metrics.prometheus_text().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            server = ThreadingHTTPServer((host, port), Handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f'metrics-{port}', daemon=True).start()
+            _servers[(host, port)] = server
+        server.metrics = metrics
+        return server
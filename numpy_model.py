@@ -0,0 +1,163 @@
+import json
+
+import h5py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from features import canonical_features, uses_features
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'softmax': lambda x: _softmax(x),
+}
+
+
+def _softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+def _same_padding(size, window, stride):
+    """
+    Return (before, after) padding that reproduces TensorFlow's 'same' mode.
+    """
+    out = -(-size // stride)
+    total = max((out - 1) * stride + window - size, 0)
+    return total // 2, total - total // 2
+
+
+def conv2d(x, kernel, bias, padding):
+    """
+    Stride-1 NHWC convolution as a single im2col matmul.
+    """
+    kh, kw = kernel.shape[:2]
+    if padding == 'same':
+        pad_h = _same_padding(x.shape[1], kh, 1)
+        pad_w = _same_padding(x.shape[2], kw, 1)
+        x = np.pad(x, ((0, 0), pad_h, pad_w, (0, 0)))
+    # (n, out_h, out_w, c, kh, kw) -> (n, out_h, out_w, kh, kw, c) to match the Keras kernel layout
+    windows = sliding_window_view(x, (kh, kw), axis=(1, 2)).transpose(0, 1, 2, 4, 5, 3)
+    n, out_h, out_w = windows.shape[:3]
+    cols = windows.reshape(n * out_h * out_w, -1)
+    out = cols @ kernel.reshape(-1, kernel.shape[-1])
+    out += bias
+    return out.reshape(n, out_h, out_w, -1)
+
+
+def max_pool2d(x, pool_size, strides, padding):
+    """
+    NHWC max pooling using strided window views (no Python loops).
+    """
+    ph, pw = pool_size
+    sh, sw = strides
+    if padding == 'same':
+        pad_h = _same_padding(x.shape[1], ph, sh)
+        pad_w = _same_padding(x.shape[2], pw, sw)
+        x = np.pad(x, ((0, 0), pad_h, pad_w, (0, 0)), constant_values=-np.inf)
+    windows = sliding_window_view(x, (ph, pw), axis=(1, 2))[:, ::sh, ::sw]
+    return windows.max(axis=(-2, -1))
+
+
+class NumpyGestureModel:
+    """
+    Pure-NumPy forward pass for the Sequential gesture model.
+
+    Weights and layer configuration are read straight from the Keras HDF5
+    file, so kiosks can run inference without importing TensorFlow.
+    Supports the layers the gesture models use: Conv2D (stride 1),
+    MaxPooling2D, Flatten, Dense and Dropout (identity at inference).
+    Models that take canonical features get them computed from the raw
+    landmarks first, as in GesturePredictor.
+    """
+
+    def __init__(self, layers, input_shape):
+        self.layers = layers
+        self.input_shape = tuple(input_shape)
+        self.uses_features = uses_features(self.input_shape)
+
+    @classmethod
+    def from_h5(cls, path):
+        """
+        Build the model from a Keras .h5 file saved with model.save().
+        """
+        with h5py.File(path, 'r') as f:
+            config = json.loads(f.attrs['model_config'])
+            if config['class_name'] != 'Sequential':
+                raise ValueError(f"Only Sequential models are supported, got {config['class_name']}")
+
+            weights_group = f['model_weights']
+            layer_configs = config['config']['layers']
+            input_shape = None
+            layers = []
+
+            for layer in layer_configs:
+                kind = layer['class_name']
+                cfg = layer['config']
+                shape = cfg.get('batch_shape') or cfg.get('batch_input_shape')
+                if input_shape is None and shape is not None:
+                    input_shape = shape[1:]
+                if kind == 'InputLayer':
+                    continue
+
+                group = weights_group[cfg['name']] if cfg['name'] in weights_group else None
+                weights = []
+                if group is not None:
+                    for name in group.attrs.get('weight_names', []):
+                        name = name.decode() if isinstance(name, bytes) else name
+                        weights.append(np.asarray(group[name], dtype=np.float32))
+
+                layers.append(cls._build_layer(kind, cfg, weights))
+
+        if input_shape is None:
+            raise ValueError(f"Could not determine the input shape of {path}")
+        return cls(layers, input_shape)
+
+    @staticmethod
+    def _build_layer(kind, cfg, weights):
+        """
+        Turn one Keras layer config into a callable on NHWC float32 arrays.
+        """
+        if kind == 'Conv2D':
+            if tuple(cfg['strides']) != (1, 1) or tuple(cfg['dilation_rate']) != (1, 1) or cfg.get('groups', 1) != 1:
+                raise ValueError(f"Unsupported Conv2D configuration in layer {cfg['name']}")
+            kernel, bias = weights if cfg['use_bias'] else (weights[0], np.zeros(cfg['filters'], np.float32))
+            activation = ACTIVATIONS[cfg['activation']]
+            padding = cfg['padding']
+            return lambda x: activation(conv2d(x, kernel, bias, padding))
+
+        if kind == 'MaxPooling2D':
+            pool_size = tuple(cfg['pool_size'])
+            strides = tuple(cfg['strides'] or pool_size)
+            padding = cfg['padding']
+            return lambda x: max_pool2d(x, pool_size, strides, padding)
+
+        if kind == 'Flatten':
+            return lambda x: x.reshape(x.shape[0], -1)
+
+        if kind == 'Dense':
+            kernel, bias = weights if cfg['use_bias'] else (weights[0], np.zeros(cfg['units'], np.float32))
+            activation = ACTIVATIONS[cfg['activation']]
+            return lambda x: activation(x @ kernel + bias)
+
+        if kind == 'Dropout':
+            return lambda x: x
+
+        raise ValueError(f"Unsupported layer type: {kind}")
+
+    def predict(self, landmarks):
+        """
+        Return class probabilities with shape (batch, num_classes).
+        Accepts the (1, 21, 3, 1) array produced by preprocess_frame.
+        """
+        if self.uses_features:
+            x = canonical_features(landmarks)
+        else:
+            x = np.asarray(landmarks, dtype=np.float32).reshape((-1,) + self.input_shape)
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    __call__ = predict
@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+
+# Marks the end of the stream as it travels through the stage queues
+_END = object()
+
+
+def put_latest(q, item):
+    """
+    Put item into a bounded queue, discarding the oldest entries when it is full.
+    Returns the number of discarded entries.
+    """
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class Stage:
+    """
+    One pipeline step: fn(packet) -> packet, or None to discard the frame.
+    """
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.processed = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+        self.input = None
+
+
+class FramePipeline:
+    """
+    Runs capture -> stage -> stage -> ... with one worker thread per stage.
+
+    Stages are connected by small bounded queues. When a downstream stage
+    falls behind, the oldest waiting frame is dropped instead of queued, so
+    latency stays bounded by the slowest stage rather than growing over time.
+    Packets are dicts; the source's frame is stored under 'frame'.
+
+    thread_hook, if given, is called with each worker thread before it starts
+    (e.g. Streamlit's add_script_run_ctx).
+
+    An exception in the source or a stage ends the stream: it is kept in
+    `error` and raised from the next get().
+    """
+
+    def __init__(self, source, stages, queue_size=1, thread_hook=None):
+        self.source = source
+        self.thread_hook = thread_hook
+        self.stages = stages
+        self.queue_size = queue_size
+        for stage in stages:
+            stage.input = queue.Queue(maxsize=queue_size)
+        self.output = queue.Queue(maxsize=queue_size)
+        self.frames_in = 0
+        self.frames_out = 0
+        self.output_dropped = 0
+        self.running = False
+        self.error = None
+        self._threads = []
+        self._started_at = None
+
+    def start(self):
+        self.running = True
+        self._started_at = time.monotonic()
+        targets = [threading.Thread(target=self._source_loop, name='pipeline-source', daemon=True)]
+        for stage, next_stage in zip(self.stages, self.stages[1:] + [None]):
+            targets.append(threading.Thread(
+                target=self._stage_loop, args=(stage, next_stage), name=f'pipeline-{stage.name}', daemon=True
+            ))
+        self._threads = targets
+        for thread in self._threads:
+            if self.thread_hook:
+                self.thread_hook(thread)
+            thread.start()
+        return self
+
+    def _source_loop(self):
+        first = self.stages[0] if self.stages else None
+        target = first.input if first else self.output
+        while self.running:
+            try:
+                frame = self.source()
+            except Exception as e:
+                self._fail(e)
+                return
+            if frame is None:
+                put_latest(target, _END)
+                return
+            self.frames_in += 1
+            packet = {'seq': self.frames_in, 'frame': frame, 'captured_at': time.perf_counter()}
+            dropped = put_latest(target, packet)
+            if first:
+                first.dropped += dropped
+            else:
+                self.output_dropped += dropped
+
+    def _stage_loop(self, stage, next_stage):
+        downstream = next_stage.input if next_stage else self.output
+        while self.running:
+            try:
+                packet = stage.input.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if packet is _END:
+                put_latest(downstream, _END)
+                return
+
+            start = time.perf_counter()
+            try:
+                packet = stage.fn(packet)
+            except Exception as e:
+                self._fail(e)
+                return
+            stage.busy_seconds += time.perf_counter() - start
+            stage.processed += 1
+            if packet is None:
+                continue
+
+            dropped = put_latest(downstream, packet)
+            if next_stage:
+                next_stage.dropped += dropped
+            else:
+                self.output_dropped += dropped
+
+    def _fail(self, error):
+        if self.error is None:
+            self.error = error
+        # Wakes up get(); stages still running are stopped from there
+        put_latest(self.output, _END)
+
+    def get(self, timeout=1.0):
+        """
+        Return the next finished packet, or None on timeout or end of stream.
+        Raises the exception that ended the stream, if any.
+        """
+        try:
+            packet = self.output.get(timeout=timeout)
+        except queue.Empty:
+            packet = None
+        if self.error is not None:
+            self.running = False
+            raise self.error
+        if packet is None:
+            return None
+        if packet is _END:
+            self.running = False
+            return None
+        self.frames_out += 1
+        return packet
+
+    def stats(self):
+        """
+        Per-stage throughput (frames/s), mean busy time, queue depth and drops.
+        """
+        elapsed = max(time.monotonic() - self._started_at, 1e-9) if self._started_at else 1e-9
+        rows = [{'stage': 'source', 'fps': self.frames_in / elapsed, 'busy_ms': 0.0, 'queue_depth': 0, 'dropped': 0}]
+        for stage in self.stages:
+            rows.append({
+                'stage': stage.name,
+                'fps': stage.processed / elapsed,
+                'busy_ms': 1e3 * stage.busy_seconds / stage.processed if stage.processed else 0.0,
+                'queue_depth': stage.input.qsize(),
+                'dropped': stage.dropped,
+            })
+        rows.append({'stage': 'output', 'fps': self.frames_out / elapsed, 'busy_ms': 0.0,
+                     'queue_depth': self.output.qsize(), 'dropped': self.output_dropped})
+        return rows
+
+    def stop(self):
+        self.running = False
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
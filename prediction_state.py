@@ -0,0 +1,206 @@
+import time
+from collections import deque
+
+import numpy as np
+
+
+class MotionGate:
+    """
+    Skip classification while the hand holds still.
+
+    Each landmark tensor is compared with the one that was last classified:
+    when the mean absolute change of the normalized coordinates is below
+    `epsilon`, the cached result is returned instead of calling the model.
+    A fresh classification is forced once the cached result is older than
+    `max_age` seconds, so slow drifts are still picked up.
+
+    hits counts frames served from the cache, misses frames that ran the
+    model; hit_rate is the share of model calls saved. `clock` is
+    time.monotonic unless replaying recorded frames at their own timestamps.
+    """
+
+    def __init__(self, epsilon=0.004, max_age=0.5, clock=time.monotonic):
+        self.epsilon = epsilon
+        self.max_age = max_age
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.last_hit = False
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the cached result, e.g. when the hand leaves the frame.
+        """
+        self.reference = None
+        self.result = None
+        self.classified_at = 0.0
+
+    def delta(self, landmarks):
+        """
+        Mean absolute change from the last classified landmarks (inf if there
+        are none, or if they had a different number of hands).
+        """
+        if self.reference is None or self.reference.shape != np.shape(landmarks):
+            return np.inf
+        return float(np.mean(np.abs(landmarks - self.reference)))
+
+    def __call__(self, landmarks, classify):
+        """
+        Return classify(landmarks), or the cached result if the landmarks have not moved.
+        """
+        now = self.clock()
+        if self.delta(landmarks) < self.epsilon and now - self.classified_at < self.max_age:
+            self.hits += 1
+            self.last_hit = True
+            return self.result
+
+        self.result = classify(landmarks)
+        # Copy: callers may pass a reused landmark buffer
+        self.reference = np.array(landmarks, dtype=np.float32)
+        self.classified_at = now
+        self.misses += 1
+        self.last_hit = False
+        return self.result
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PredictionSmoother:
+    """
+    Temporal smoothing of the classifier output over the last `window` frames.
+
+    Probability vectors go into a preallocated ring buffer. With
+    method='majority' the label is the most frequent per-frame argmax in the
+    buffer and the confidence its mean probability; with method='ema' the
+    buffered vectors are averaged with weights (1 - alpha) ** age, so the
+    newest frame counts most and nothing older than the window is kept.
+    """
+
+    METHODS = ('majority', 'ema')
+
+    def __init__(self, window=8, method='ema', alpha=0.3):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown smoothing method {method!r}, expected one of {self.METHODS}")
+        self.window = window
+        self.method = method
+        self.weights = (1 - alpha) ** np.arange(window, dtype=np.float32)
+        self.history = None
+        self.reset()
+
+    def reset(self):
+        """
+        Drop the buffered frames, e.g. when the hand leaves the frame.
+        """
+        self.position = 0
+        self.count = 0
+
+    def update(self, probabilities):
+        """
+        Add one frame's probability vector. Returns the smoothed (class index, confidence).
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+        if self.history is None or self.history.shape[1] != probabilities.size:
+            self.history = np.zeros((self.window, probabilities.size), dtype=np.float32)
+            self.reset()
+        self.history[self.position] = probabilities
+        self.position = (self.position + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+        # Rows newest first
+        recent = self.history[(self.position - 1 - np.arange(self.count)) % self.window]
+        if self.method == 'majority':
+            labels = recent.argmax(axis=1)
+            votes = np.bincount(labels, minlength=recent.shape[1])
+            # Ties go to the label seen most recently
+            index = int(labels[np.argmax(votes[labels] == votes.max())])
+            return index, float(recent[:, index].mean())
+
+        weights = self.weights[:self.count]
+        smoothed = weights @ recent / weights.sum()
+        index = int(np.argmax(smoothed))
+        return index, float(smoothed[index])
+
+
+class HandSmoothers:
+    """
+    One PredictionSmoother per hand for frames with several hands, keyed by
+    handedness; a hand's history is dropped when it leaves the frame.
+    Takes the PredictionSmoother arguments.
+    """
+
+    def __init__(self, window=8, method='ema', alpha=0.3):
+        # Built once so bad arguments fail here rather than on the first hand
+        PredictionSmoother(window, method, alpha)
+        self.options = dict(window=window, method=method, alpha=alpha)
+        self.smoothers = {}
+
+    def reset(self):
+        self.smoothers.clear()
+
+    def update(self, handedness, probabilities):
+        """
+        Add one frame: probabilities has a row per entry of handedness.
+        Returns the smoothed (class index, confidence) of each hand, in the same order.
+        """
+        # Two hands may get the same label; tell them apart by position
+        keys = [(hand, handedness[:i].count(hand)) for i, hand in enumerate(handedness)]
+        for key in set(self.smoothers) - set(keys):
+            del self.smoothers[key]
+        results = []
+        for key, row in zip(keys, probabilities):
+            if key not in self.smoothers:
+                self.smoothers[key] = PredictionSmoother(**self.options)
+            results.append(self.smoothers[key].update(row))
+        return results
+
+
+class PredictionDisplay:
+    """
+    Decides when the prediction box actually needs re-rendering.
+
+    should_update(label, confidence) is True only when the label differs from
+    the one on screen or the confidence falls into a different
+    `confidence_step` bucket; label None stands for "no hand". With several
+    hands, pass a tuple of labels and a sequence of confidences. Every True
+    counts as one message to the browser, and messages_per_second is the
+    rate over the last `rate_window` seconds.
+    """
+
+    def __init__(self, confidence_step=0.05, rate_window=5.0, clock=time.monotonic):
+        self.confidence_step = confidence_step
+        self.rate_window = rate_window
+        self.clock = clock
+        self.messages = 0
+        self._sent_at = deque()
+        self._started_at = clock()
+        self.shown = ()
+
+    def bucket(self, confidence):
+        """
+        Confidence rounded down to its display bucket, i.e. the value to show.
+        """
+        return np.floor(confidence / self.confidence_step + 1e-6) * self.confidence_step
+
+    def should_update(self, label, confidence=None):
+        if confidence is not None:
+            confidence = tuple(round(float(bucket), 6) for bucket in self.bucket(np.atleast_1d(confidence)))
+        state = (label, confidence)
+        if state == self.shown:
+            return False
+        self.shown = state
+        self.messages += 1
+        self._sent_at.append(self.clock())
+        return True
+
+    @property
+    def messages_per_second(self):
+        now = self.clock()
+        while self._sent_at and now - self._sent_at[0] > self.rate_window:
+            self._sent_at.popleft()
+        # At least one second, so the first message does not read as a huge rate
+        elapsed = max(min(now - self._started_at, self.rate_window), 1.0)
+        return len(self._sent_at) / elapsed
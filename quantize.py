@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from features import canonical_features, uses_features
+from inference import LANDMARK_SHAPE, MODEL_PATH
+from tflite_model import TFLiteGestureModel
+from training_data import load_splits
+
+VARIANTS = ('float32', 'float16', 'dynamic_int8', 'int8')
+
+
+def convert(model, variant, calibration=None):
+    """
+    Convert a Keras model to TFLite flatbuffer bytes.
+
+    float32 is the unquantized reference; float16 stores the weights as
+    float16; dynamic_int8 stores int8 weights and quantizes activations on
+    the fly; int8 quantizes weights and activations, input and output
+    included, with ranges calibrated on `calibration` (model inputs).
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if variant == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == 'dynamic_int8':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant == 'int8':
+        if calibration is None:
+            raise ValueError("Full int8 quantization needs calibration samples")
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([sample[None]] for sample in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif variant != 'float32':
+        raise ValueError(f"Unknown variant '{variant}', expected one of {VARIANTS}")
+    return converter.convert()
+
+
+def variant_path(out_dir, model_path, variant):
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(out_dir, f"{stem}.{variant}.tflite")
+
+
+def export_variants(model_path=MODEL_PATH, store_path='sign_language_data1.lmstore', out_dir='tflite_models',
+                    variants=VARIANTS, calibration_samples=200, seed=42):
+    """
+    Write each variant of the Keras model to out_dir; returns {variant: path}.
+    Full int8 is calibrated on up to calibration_samples training-split samples of the store.
+    """
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    splits, _ = load_splits(store_path, seed=seed)
+    train_x = splits['train'][0]
+    rng = np.random.default_rng(seed)
+    train_x = train_x[rng.permutation(len(train_x))[:calibration_samples]]
+    if uses_features(model.input_shape[1:]):
+        calibration = canonical_features(train_x)
+    else:
+        calibration = train_x.reshape((-1,) + LANDMARK_SHAPE)
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for variant in variants:
+        paths[variant] = variant_path(out_dir, model_path, variant)
+        with open(paths[variant], 'wb') as f:
+            f.write(convert(model, variant, calibration.astype(np.float32)))
+    return paths
+
+
+def evaluate_variant(path, test_x, test_y, num_threads=1, iterations=500, reference=None):
+    """
+    Size, load time, single-sample latency and test accuracy of one .tflite file.
+    reference, if given, is the float model's predicted class per test sample.
+    """
+    start = time.perf_counter()
+    model = TFLiteGestureModel(path, num_threads=num_threads)
+    load_ms = (time.perf_counter() - start) * 1e3
+
+    sample = test_x[:1]
+    model.predict(sample)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model.predict(sample)
+        latencies.append(time.perf_counter() - start)
+
+    predicted = model.predict(test_x).argmax(axis=1)
+    row = {
+        'size_kb': os.path.getsize(path) / 1024,
+        'load_ms': load_ms,
+        'p50_us': float(np.median(latencies)) * 1e6,
+        'p95_us': float(np.percentile(latencies, 95)) * 1e6,
+        'accuracy': float((predicted == test_y).mean()),
+    }
+    if reference is not None:
+        row['agreement'] = float((predicted == reference).mean())
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export quantized TFLite variants of the gesture model and compare them.")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--out', default='tflite_models')
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--threads', type=int, default=1, help='interpreter threads')
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--calibration-samples', type=int, default=200)
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args()
+
+    paths = export_variants(args.model, args.store, args.out, args.variants, args.calibration_samples)
+    splits, _ = load_splits(args.store)
+    test_x, test_y = splits['test']
+    test_x = test_x.reshape((-1,) + LANDMARK_SHAPE)
+    reference = None
+    if 'float32' in paths:
+        reference = TFLiteGestureModel(paths['float32']).predict(test_x).argmax(axis=1)
+
+    print(f"{len(test_y)} held-out samples, {args.threads} interpreter thread(s)\n")
+    print(f"{'variant':<14}{'size KB':>9}{'load ms':>9}{'p50 us':>8}{'p95 us':>8}{'accuracy':>10}{'agreement':>11}")
+    report = {}
+    for variant, path in paths.items():
+        row = report[variant] = evaluate_variant(path, test_x, test_y, args.threads, args.iterations, reference)
+        agreement = f"{row['agreement']:.1%}" if 'agreement' in row else '-'
+        print(f"{variant:<14}{row['size_kb']:>9.1f}{row['load_ms']:>9.1f}{row['p50_us']:>8.1f}{row['p95_us']:>8.1f}"
+              f"{row['accuracy']:>10.1%}{agreement:>11}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'model': args.model, 'threads': args.threads, 'variants': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
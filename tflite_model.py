@@ -0,0 +1,76 @@
+import numpy as np
+
+from features import canonical_features, uses_features
+
+
+def _interpreter_class():
+    """
+    The lightest TFLite interpreter available: LiteRT or tflite_runtime, else the one bundled with TensorFlow.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteGestureModel:
+    """
+    Gesture model inference on a .tflite file (see quantize.py).
+
+    Handles float32, float16 and dynamic-range models as well as full int8
+    models, whose input is quantized and output dequantized here with the
+    scales stored in the file, so predict() always takes raw float landmarks
+    and returns float probabilities like the other backends. Feature-input
+    models (the MLP tier) get canonical features computed first.
+
+    The interpreter stays at batch size 1 and batches run one sample at a
+    time: resizing the input of dynamic-range models crashes the TFLite
+    interpreter, and the live loop only ever sends single frames.
+    """
+
+    def __init__(self, path, num_threads=1):
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(self._input['shape'][1:])
+        self.uses_features = uses_features(self.input_shape)
+
+    def _quantize(self, x):
+        scale, zero_point = self._input['quantization']
+        if self._input['dtype'] == np.float32 or not scale:
+            return x.astype(self._input['dtype'], copy=False)
+        info = np.iinfo(self._input['dtype'])
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(self._input['dtype'])
+
+    def _dequantize(self, y):
+        scale, zero_point = self._output['quantization']
+        if self._output['dtype'] == np.float32 or not scale:
+            return y.astype(np.float32, copy=False)
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def predict(self, landmarks):
+        """
+        Return class probabilities with shape (batch, num_classes).
+        Accepts the (1, 21, 3, 1) array produced by preprocess_frame.
+        """
+        if self.uses_features:
+            x = canonical_features(landmarks)
+        else:
+            x = np.asarray(landmarks, dtype=np.float32).reshape((-1,) + self.input_shape)
+        x = self._quantize(x)
+        outputs = []
+        for i in range(len(x)):
+            self.interpreter.set_tensor(self._input['index'], x[i:i + 1])
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self._output['index']))
+        return self._dequantize(np.concatenate(outputs))
+
+    __call__ = predict
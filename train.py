@@ -0,0 +1,111 @@
+import argparse
+import pickle
+
+import tensorflow as tf
+
+from augment import augment_tf
+from features import FEATURE_SIZE, canonical_features_tf
+from inference import LABEL_MAP_PATH, LANDMARK_SHAPE, MLP_MODEL_PATH, MODEL_PATH
+from training_data import StepRateCallback, load_splits, make_dataset
+
+
+def build_model(num_classes):
+    """
+    The gesture CNN from datacollection.ipynb.
+    """
+    from tensorflow.keras.layers import Conv2D, Dense, Dropout, Flatten, Input, MaxPooling2D
+    from tensorflow.keras.models import Sequential
+
+    model = Sequential([
+        Input(LANDMARK_SHAPE),
+        Conv2D(32, (3, 3), activation='relu', padding='same'),
+        MaxPooling2D(pool_size=(2, 1), padding='same'),
+        Conv2D(64, (3, 3), activation='relu', padding='same'),
+        MaxPooling2D(pool_size=(2, 1), padding='same'),
+        Flatten(),
+        Dense(128, activation='relu'),
+        Dropout(0.5),
+        Dense(num_classes, activation='softmax'),
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def build_mlp_model(num_classes, units=64):
+    """
+    Compact tier on canonical features (features.py) instead of raw coordinates.
+    """
+    from tensorflow.keras.layers import Dense, Dropout, Input
+    from tensorflow.keras.models import Sequential
+
+    model = Sequential([
+        Input((FEATURE_SIZE,)),
+        Dense(units, activation='relu'),
+        Dropout(0.2),
+        Dense(units, activation='relu'),
+        Dense(num_classes, activation='softmax'),
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+# model type -> (builder, input transform applied in the tf.data pipeline)
+MODEL_TYPES = {
+    'cnn': (build_model, None),
+    'mlp': (build_mlp_model, canonical_features_tf),
+}
+
+
+def train(store_path='sign_language_data1.lmstore', epochs=100, batch_size=32, seed=42, augment=True, verbose=1,
+          model_type='cnn'):
+    """
+    Train a gesture model ('cnn' or 'mlp') on a landmark store through the tf.data pipeline.
+    Returns (model, history, class_names, test_metrics).
+    """
+    builder, transform = MODEL_TYPES[model_type]
+    tf.keras.utils.set_random_seed(seed)
+    splits, class_names = load_splits(store_path, seed=seed)
+    datasets = {
+        name: make_dataset(
+            features, class_ids, len(class_names), batch_size,
+            training=name == 'train', augment=augment_tf if augment else None, seed=seed, transform=transform,
+        )
+        for name, (features, class_ids) in splits.items()
+    }
+    model = builder(len(class_names))
+    history = model.fit(
+        datasets['train'],
+        validation_data=datasets['validation'],
+        epochs=epochs,
+        callbacks=[StepRateCallback(batch_size)],
+        verbose=verbose,
+    )
+    test_metrics = model.evaluate(datasets['test'], return_dict=True, verbose=0)
+    return model, history, class_names, test_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a gesture model from a landmark store.")
+    parser.add_argument('--model-type', choices=sorted(MODEL_TYPES), default='cnn')
+    parser.add_argument('--store', default='sign_language_data1.lmstore')
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-augment', action='store_true')
+    parser.add_argument('--model', help=f"where to save the trained model (default {MODEL_PATH}, {MLP_MODEL_PATH} for mlp)")
+    parser.add_argument('--label-map', default=LABEL_MAP_PATH)
+    args = parser.parse_args()
+
+    model, history, class_names, test_metrics = train(
+        args.store, args.epochs, args.batch_size, args.seed, augment=not args.no_augment, verbose=2,
+        model_type=args.model_type,
+    )
+    rates = history.history['steps_per_second']
+    print(f"{sum(rates) / len(rates):.0f} steps/s on average, test accuracy {test_metrics['accuracy']:.3f}")
+    model.save(args.model or (MLP_MODEL_PATH if args.model_type == 'mlp' else MODEL_PATH))
+    with open(args.label_map, 'wb') as f:
+        pickle.dump(dict(enumerate(class_names)), f)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from augment import augment_tf
+from landmark_store import LandmarkStore
+
+AUTOTUNE = tf.data.AUTOTUNE
+SPLIT_FRACTIONS = (0.7, 0.15, 0.15)
+
+
+def split_indices(label_ids, fractions=SPLIT_FRACTIONS, seed=42):
+    """
+    Seeded stratified split of sample indices into (train, validation, test).
+    Each label is shuffled and divided by fractions on its own, so small
+    classes are represented in every part.
+    """
+    rng = np.random.default_rng(seed)
+    parts = ([], [], [])
+    for label_id in np.unique(label_ids):
+        indices = rng.permutation(np.flatnonzero(label_ids == label_id))
+        n_val = int(round(len(indices) * fractions[1]))
+        n_test = int(round(len(indices) * fractions[2]))
+        n_train = len(indices) - n_val - n_test
+        parts[0].append(indices[:n_train])
+        parts[1].append(indices[n_train:n_train + n_val])
+        parts[2].append(indices[n_train + n_val:])
+    return tuple(np.sort(np.concatenate(part)) for part in parts)
+
+
+def load_splits(store_path, fractions=SPLIT_FRACTIONS, seed=42):
+    """
+    Read a LandmarkStore and split it.
+
+    Returns (splits, class_names): splits maps 'train' / 'validation' / 'test'
+    to (features (n, 21, 3) float32, class index per sample). Class indices
+    follow the sorted label names, the order LabelEncoder and label_map.pkl use.
+    """
+    store = LandmarkStore(store_path)
+    class_names = sorted(store.labels)
+    # Store label ids are in first-seen order; remap them to sorted order
+    remap = np.array([class_names.index(label) for label in store.labels], dtype=np.int32)
+    features = np.array(store.features)
+    class_ids = remap[store.label_ids]
+    splits = {
+        name: (features[indices], class_ids[indices])
+        for name, indices in zip(('train', 'validation', 'test'), split_indices(class_ids, fractions, seed))
+    }
+    return splits, class_names
+
+
+def make_dataset(features, class_ids, num_classes, batch_size=32, training=False, augment=augment_tf,
+                 seed=42, cache=True, transform=None):
+    """
+    tf.data pipeline yielding ((batch, 21, 3, 1) float32, one-hot labels) batches,
+    or (transform(batch), one-hot labels) when a transform is given (e.g.
+    features.canonical_features_tf for the MLP), applied after augmentation.
+
+    The samples are cached after the first pass; training datasets are
+    reshuffled every epoch from a fixed seed and augmented per batch inside
+    the graph with augment(features, seed) (augment.augment_tf by default),
+    so no Python runs per sample.
+    Batches are prefetched while the model trains on the previous one.
+    """
+    dataset = tf.data.Dataset.from_tensor_slices((
+        np.asarray(features, dtype=np.float32).reshape((-1, 21, 3)),
+        np.asarray(class_ids, dtype=np.int32),
+    ))
+    if cache:
+        dataset = dataset.cache()
+    if training:
+        dataset = dataset.shuffle(len(class_ids), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+
+    def to_model_input(x, y):
+        x = transform(x) if transform is not None else tf.expand_dims(x, -1)
+        return x, tf.one_hot(y, num_classes)
+
+    if training and augment is not None:
+        # One stateless seed pair per batch, different every epoch but reproducible
+        seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True).batch(2)
+        dataset = tf.data.Dataset.zip((dataset, seeds)).map(
+            lambda batch, batch_seed: to_model_input(augment(batch[0], batch_seed), batch[1]),
+            num_parallel_calls=AUTOTUNE,
+        )
+    else:
+        dataset = dataset.map(to_model_input, num_parallel_calls=AUTOTUNE)
+    return dataset.prefetch(AUTOTUNE)
+
+
+class StepRateCallback(tf.keras.callbacks.Callback):
+    """
+    Records training throughput per epoch: steps_per_second and
+    samples_per_second are added to the epoch logs (and so to history).
+    A falling rate as the dataset grows means the input side is the limit.
+    """
+
+    def __init__(self, batch_size):
+        super().__init__()
+        self.batch_size = batch_size
+        self._steps = 0
+        self._started = None
+        self._finished = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._steps = 0
+        self._started = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._steps += 1
+        self._finished = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        # Up to the last training step, so validation is not counted
+        elapsed = (self._finished or self._started) - self._started
+        if logs is not None and elapsed > 0:
+            logs['steps_per_second'] = self._steps / elapsed
+            logs['samples_per_second'] = self._steps * self.batch_size / elapsed
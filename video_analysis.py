@@ -0,0 +1,425 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from frame_processing import HANDS_CONFIG, FrameProcessor
+from inference import LANDMARK_SHAPE, MODEL_PATH
+
+# Per-process predictor and Hands tracker of a parallel analysis worker
+_worker = {}
+
+
+def iter_video_frames(path, start=0, stop=None, stride=1):
+    """
+    Decode a video file one frame at a time, yielding (frame_index, BGR frame).
+    Frames skipped by `stride` are grabbed but not decoded.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video {path!r}")
+    try:
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        index = start
+        while stop is None or index < stop:
+            if (index - start) % stride:
+                if not cap.grab():
+                    break
+            else:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield index, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def video_info(path):
+    """
+    (frame_count, fps) as reported by the container.
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS) or 30.0
+    finally:
+        cap.release()
+
+
+class VideoAnalysis:
+    """
+    Per-frame results of analyze_video.
+
+    frame_indices, class_indices and confidences are aligned arrays with one
+    entry per analyzed frame; class_indices is -1 where no hand was found.
+    landmarks holds the matching (frames, 21, 3) coordinates, NaN without a
+    hand. stats holds frame counts, per-stage seconds and overall throughput.
+    """
+
+    def __init__(self, fps, frame_indices, class_indices, confidences, stats, landmarks=None):
+        self.fps = fps
+        self.frame_indices = frame_indices
+        self.class_indices = class_indices
+        self.confidences = confidences
+        self.stats = stats
+        self.landmarks = landmarks
+
+    @property
+    def times(self):
+        return self.frame_indices / self.fps
+
+    def timeline(self, classes):
+        """
+        One row per analyzed frame: frame, time, gesture (None without a hand), confidence.
+        """
+        return [
+            {
+                'frame': int(frame),
+                'time': float(frame / self.fps),
+                'gesture': classes[index] if index >= 0 else None,
+                'confidence': float(confidence),
+            }
+            for frame, index, confidence in zip(self.frame_indices, self.class_indices, self.confidences)
+        ]
+
+    def segments(self, classes, min_frames=1):
+        """
+        Runs of consecutive frames with the same gesture, shorter runs than
+        min_frames dropped: start, end (seconds), gesture, frames, mean confidence.
+        """
+        rows = []
+        boundaries = np.flatnonzero(np.diff(self.class_indices)) + 1
+        for run in np.split(np.arange(len(self.class_indices)), boundaries):
+            if not len(run) or self.class_indices[run[0]] < 0 or len(run) < min_frames:
+                continue
+            rows.append({
+                'start': float(self.frame_indices[run[0]] / self.fps),
+                'end': float((self.frame_indices[run[-1]] + 1) / self.fps),
+                'gesture': classes[self.class_indices[run[0]]],
+                'frames': len(run),
+                'confidence': float(self.confidences[run].mean()),
+            })
+        return rows
+
+
+def cache_settings(start, stop, stride, shard_plan=None):
+    """
+    Everything besides the video content that determines the extracted landmarks.
+    A parallel analysis restarts the hand tracker at every shard, so its
+    landmarks differ from a sequential pass and are keyed by the shard plan.
+    """
+    settings = dict(HANDS_CONFIG, start=start, stop=stop, stride=stride)
+    if shard_plan is not None:
+        settings.update(parallel=True, shard_plan=shard_plan)
+    return settings
+
+
+def expected_frames(frame_count, start=0, stop=None, stride=1):
+    """
+    How many frames an analysis of [start, stop) should see, going by the
+    container's frame count. That count is only an estimate (0 for many
+    streams), so it sizes progress reports and shards but never ends decoding.
+    """
+    if frame_count:
+        stop = frame_count if stop is None else min(stop, frame_count)
+    return 0 if stop is None else len(range(start, stop, stride))
+
+
+def classify_landmarks(landmarks, predictor, batch_size=64):
+    """
+    Classify (frames, 21, 3) landmarks in batches, skipping NaN (no hand) rows.
+    Returns (class_indices, confidences, inference seconds).
+    """
+    class_indices = np.full(len(landmarks), -1, dtype=np.int64)
+    confidences = np.zeros(len(landmarks), dtype=np.float32)
+    rows = np.flatnonzero(~np.isnan(landmarks[:, 0, 0]))
+    started = time.perf_counter()
+    for first in range(0, len(rows), batch_size):
+        batch_rows = rows[first:first + batch_size]
+        prediction = predictor.predict(np.asarray(landmarks[batch_rows], dtype=np.float32)[..., np.newaxis])
+        best = np.argmax(prediction, axis=1)
+        class_indices[batch_rows] = best
+        confidences[batch_rows] = prediction[np.arange(len(best)), best]
+    return class_indices, confidences, time.perf_counter() - started
+
+
+def _analyze_cached(fps, frame_indices, landmarks, predictor, batch_size, hash_seconds):
+    started = time.perf_counter()
+    class_indices, confidences, inference_seconds = classify_landmarks(landmarks, predictor, batch_size)
+    seconds = time.perf_counter() - started + hash_seconds
+    stats = dict(
+        frames=len(frame_indices),
+        hand_frames=int(np.count_nonzero(class_indices >= 0)),
+        seconds=seconds,
+        fps=len(frame_indices) / seconds if seconds > 0 else 0.0,
+        batch_size=batch_size,
+        decode_seconds=0.0,
+        landmarks_seconds=0.0,
+        inference_seconds=inference_seconds,
+        hash_seconds=hash_seconds,
+        cached=True,
+    )
+    return VideoAnalysis(fps, np.array(frame_indices), class_indices, confidences, stats, landmarks)
+
+
+def _cache_lookup(cache, path, start, stop, stride, shard_plan=None):
+    """
+    (key, cached entry or None, seconds spent hashing) for a LandmarkCache.
+    """
+    started = time.perf_counter()
+    key = cache.key(path, cache_settings(start, stop, stride, shard_plan))
+    return key, cache.get(key), time.perf_counter() - started
+
+
+def analyze_video(path, predictor, start=0, stop=None, stride=1, batch_size=64, progress=None, hands=None,
+                  cache=None):
+    """
+    Classify the hand gesture in every frame of a video file.
+
+    Frames are decoded one at a time and their landmarks written into a
+    (batch_size, 21, 3, 1) buffer; each full buffer is classified with a
+    single predictor.predict call. progress, if given, is called as
+    progress(frames_done, frames_total) every batch_size frames, frames_total
+    being the container's estimate. Without a stop the video is read to its end.
+
+    With a LandmarkCache, landmarks extracted before for the same video
+    content and settings are read back from disk and only the classifier
+    runs; otherwise the extracted landmarks are stored for next time.
+    Returns a VideoAnalysis.
+    """
+    frame_count, fps = video_info(path)
+    total = expected_frames(frame_count, start, stop, stride)
+
+    hash_seconds = 0.0
+    if cache is not None:
+        cache_key, cached, hash_seconds = _cache_lookup(cache, path, start, stop, stride)
+        if cached is not None:
+            if progress:
+                progress(len(cached[0]), len(cached[0]))
+            return _analyze_cached(fps, *cached, predictor, batch_size, hash_seconds)
+
+    own_hands = hands is None
+    if own_hands:
+        import mediapipe as mp
+        hands = mp.solutions.hands.Hands(**HANDS_CONFIG)
+    processor = FrameProcessor(hands)
+
+    batch = np.zeros((batch_size,) + LANDMARK_SHAPE, dtype=np.float32)
+    batch_rows = []
+    frame_indices, class_indices, confidences = [], [], []
+    no_hand = np.full(LANDMARK_SHAPE[:2], np.nan, dtype=np.float32)
+    landmark_rows = []
+    timings = dict(decode=0.0, landmarks=0.0, inference=0.0)
+
+    def classify_batch():
+        start_time = time.perf_counter()
+        prediction = predictor.predict(batch[:len(batch_rows)])
+        timings['inference'] += time.perf_counter() - start_time
+        best = np.argmax(prediction, axis=1)
+        for row, index, confidence in zip(batch_rows, best, prediction[np.arange(len(best)), best]):
+            class_indices[row] = index
+            confidences[row] = confidence
+        batch_rows.clear()
+
+    started = time.perf_counter()
+    try:
+        frames = iter_video_frames(path, start, stop, stride)
+        while True:
+            start_time = time.perf_counter()
+            item = next(frames, None)
+            timings['decode'] += time.perf_counter() - start_time
+            if item is None:
+                break
+            frame_index, frame = item
+
+            start_time = time.perf_counter()
+            landmarks, _ = processor.process(frame)
+            timings['landmarks'] += time.perf_counter() - start_time
+
+            frame_indices.append(frame_index)
+            class_indices.append(-1)
+            confidences.append(0.0)
+            landmark_rows.append(no_hand if landmarks is None else landmarks[0, ..., 0].copy())
+            if landmarks is not None:
+                batch[len(batch_rows)] = landmarks[0]
+                batch_rows.append(len(frame_indices) - 1)
+                if len(batch_rows) == batch_size:
+                    classify_batch()
+            if progress and len(frame_indices) % batch_size == 0:
+                progress(len(frame_indices), max(total, len(frame_indices)))
+        if batch_rows:
+            classify_batch()
+    finally:
+        if own_hands:
+            hands.close()
+
+    frame_indices = np.array(frame_indices, dtype=np.int64)
+    landmarks = np.array(landmark_rows, dtype=np.float32).reshape((-1,) + LANDMARK_SHAPE[:2])
+    if cache is not None:
+        cache.put(cache_key, frame_indices, landmarks)
+
+    seconds = time.perf_counter() - started + hash_seconds
+    class_indices = np.array(class_indices, dtype=np.int64)
+    stats = dict(
+        frames=len(frame_indices),
+        hand_frames=int(np.count_nonzero(class_indices >= 0)),
+        seconds=seconds,
+        fps=len(frame_indices) / seconds if seconds > 0 else 0.0,
+        batch_size=batch_size,
+        **{f'{stage}_seconds': value for stage, value in timings.items()},
+        hash_seconds=hash_seconds,
+        cached=False,
+    )
+    if progress:
+        progress(len(frame_indices), len(frame_indices))
+    return VideoAnalysis(
+        fps,
+        frame_indices,
+        class_indices,
+        np.array(confidences, dtype=np.float32),
+        stats,
+        landmarks,
+    )
+
+
+def plan_shards(start, stop, shards, overlap=30, stride=1):
+    """
+    Split the analyzed frames of [start, stop) into `shards` contiguous ranges.
+    Returns (warmup_start, start, stop) per shard: frames from warmup_start
+    to start (up to `overlap` analyzed frames) only warm up the hand tracker
+    and are dropped from the shard's results.
+    """
+    steps = len(range(start, stop, stride))
+    shards = max(1, min(shards, steps))
+    bounds = [start + stride * (steps * i // shards) for i in range(shards)] + [stop]
+    return [
+        (max(first - overlap * stride, start), first, last)
+        for first, last in zip(bounds, bounds[1:])
+    ]
+
+
+def _init_worker(model_path, backend):
+    import mediapipe as mp
+
+    from inference import load_predictor
+
+    _worker['predictor'] = load_predictor(model_path, backend=backend)
+    _worker['hands'] = mp.solutions.hands.Hands(**HANDS_CONFIG)
+
+
+def _analyze_shard(path, warmup_start, start, stop, stride, batch_size):
+    hands = _worker['hands']
+    # Tracking state from the previous shard belongs to another part of the video
+    hands.reset()
+    analysis = analyze_video(
+        path, _worker['predictor'], warmup_start, stop, stride, batch_size, hands=hands
+    )
+    keep = analysis.frame_indices >= start
+    analysis.stats['warmup_frames'] = int(np.count_nonzero(~keep))
+    return (
+        analysis.frame_indices[keep],
+        analysis.class_indices[keep],
+        analysis.confidences[keep],
+        analysis.landmarks[keep],
+        analysis.stats,
+    )
+
+
+def analyze_video_parallel(path, workers=None, shards=None, overlap=30, model_path=MODEL_PATH, backend=None,
+                           start=0, stop=None, stride=1, batch_size=64, progress=None, cache=None):
+    """
+    analyze_video for long files, split over a pool of worker processes.
+
+    The frame range is cut into `shards` pieces (default: one per worker),
+    each starting `overlap` analyzed frames early so MediaPipe's tracker is
+    warmed up at the shard boundary. Every worker loads its own model and
+    Hands instance once and reuses them for all its shards. The per-frame
+    results are merged in frame order into one VideoAnalysis; progress, if
+    given, is called as progress(frames_done, frames_total) per finished shard.
+
+    With a LandmarkCache, a cached video is classified in this process with
+    the shared predictor and no pool is started; fresh results are stored.
+    Entries are keyed by the shard plan, apart from analyze_video's.
+    """
+    from inference import get_shared_predictor
+
+    frame_count, fps = video_info(path)
+    total = expected_frames(frame_count, start, stop, stride)
+    if not total:
+        # No frame count to split the video by: analyze it in one pass to the end
+        return analyze_video(
+            path, get_shared_predictor(model_path, backend), start, stop, stride, batch_size, progress, cache=cache
+        )
+
+    workers = workers or os.cpu_count() or 1
+    plan = plan_shards(start, start + total * stride, shards or workers, overlap, stride)
+    # The frame count may be short, so the last shard reads on to the requested stop or the end of the file
+    plan[-1] = plan[-1][:2] + (stop,)
+
+    hash_seconds = 0.0
+    if cache is not None:
+        cache_key, cached, hash_seconds = _cache_lookup(cache, path, start, stop, stride, plan)
+        if cached is not None:
+            if progress:
+                progress(len(cached[0]), len(cached[0]))
+            predictor = get_shared_predictor(model_path, backend)
+            return _analyze_cached(fps, *cached, predictor, batch_size, hash_seconds)
+
+    started = time.perf_counter()
+    results = [None] * len(plan)
+    done = 0
+    # spawn: forking a process that already runs TensorFlow or MediaPipe threads is unsafe
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(model_path, backend),
+    ) as pool:
+        futures = {
+            pool.submit(_analyze_shard, path, *shard, stride, batch_size): i
+            for i, shard in enumerate(plan)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            done += len(results[i][0])
+            if progress:
+                progress(done, max(total, done))
+    frame_indices, class_indices, confidences, landmarks, shard_stats = zip(*results)
+    frame_indices = np.concatenate(frame_indices)
+    landmarks = np.concatenate(landmarks)
+    if cache is not None:
+        cache.put(cache_key, frame_indices, landmarks)
+    seconds = time.perf_counter() - started + hash_seconds
+
+    class_indices = np.concatenate(class_indices)
+    frames = len(class_indices)
+    stats = dict(
+        frames=frames,
+        hand_frames=int(np.count_nonzero(class_indices >= 0)),
+        seconds=seconds,
+        fps=frames / seconds if seconds > 0 else 0.0,
+        batch_size=batch_size,
+        workers=workers,
+        shards=len(plan),
+        warmup_frames=sum(shard['warmup_frames'] for shard in shard_stats),
+        # Summed over shards: total worker busy time, not wall time
+        **{
+            key: sum(shard[key] for shard in shard_stats)
+            for key in ('decode_seconds', 'landmarks_seconds', 'inference_seconds')
+        },
+        hash_seconds=hash_seconds,
+        cached=False,
+    )
+    return VideoAnalysis(
+        fps,
+        frame_indices,
+        class_indices,
+        np.concatenate(confidences),
+        stats,
+        landmarks,
+    )
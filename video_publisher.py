@@ -0,0 +1,123 @@
+import threading
+import time
+
+import cv2
+
+from metrics import DISABLED
+
+
+def encode_jpeg(frame, max_size=(640, 480), quality=70, channels='RGB'):
+    """
+    Downscale a frame to fit within max_size (width, height) and encode it as JPEG bytes.
+    st.image passes JPEG bytes through untouched; arrays are encoded at full size
+    and quality 100 on every call.
+    """
+    height, width = frame.shape[:2]
+    scale = min(max_size[0] / width, max_size[1] / height)
+    if scale < 1:
+        frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    if channels == 'RGB':
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    ok, data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not encode frame as JPEG")
+    return data.tobytes()
+
+
+class VideoPublisher:
+    """
+    Sends frames to a Streamlit image placeholder at a bounded rate and size.
+
+    The recognition loop calls submit() for every frame; a background thread
+    wakes at most target_fps times a second, takes only the newest submitted
+    frame and publishes it once, JPEG-encoded at no more than max_size. Frames
+    submitted in between are skipped, so the browser never receives more than
+    it can display and the recognition rate is not tied to the display rate.
+    Submitted frames must not be modified afterwards (the pipeline hands out a
+    fresh buffer per frame).
+
+    thread_hook, if given, is called with the publishing thread before it
+    starts (e.g. Streamlit's add_script_run_ctx). With a metrics.LoopMetrics,
+    JPEG encoding and the push to the browser are timed as 'encode' and
+    'image push'.
+    """
+
+    def __init__(self, placeholder, target_fps=15, max_size=(640, 480), jpeg_quality=70, thread_hook=None,
+                 metrics=None):
+        self.placeholder = placeholder
+        self.interval = 1.0 / target_fps
+        self.max_size = max_size
+        self.jpeg_quality = jpeg_quality
+        self.thread_hook = thread_hook
+        self.metrics = metrics or DISABLED
+        self.submitted = 0
+        self.published = 0
+        self.skipped = 0
+        self.bytes_sent = 0
+        self.encode_seconds = 0.0
+        self.running = False
+        self._frame = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._started_at = None
+
+    def submit(self, frame):
+        """
+        Offer the latest RGB frame; replaces any frame not yet published.
+        """
+        with self._condition:
+            if self._frame is not None:
+                self.skipped += 1
+            self._frame = frame
+            self.submitted += 1
+            self._condition.notify()
+
+    def start(self):
+        self.running = True
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='video-publisher', daemon=True)
+        if self.thread_hook:
+            self.thread_hook(self._thread)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self.running = False
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        next_publish = time.monotonic()
+        while True:
+            delay = next_publish - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._condition:
+                while self.running and self._frame is None:
+                    self._condition.wait(timeout=0.5)
+                if not self.running:
+                    return
+                frame, self._frame = self._frame, None
+
+            start = time.monotonic()
+            data = encode_jpeg(frame, self.max_size, self.jpeg_quality)
+            encode_seconds = time.monotonic() - start
+            self.encode_seconds += encode_seconds
+            self.metrics.observe('encode', encode_seconds)
+            with self.metrics.timer('image push'):
+                self.placeholder.image(data, output_format='JPEG')
+            self.published += 1
+            self.bytes_sent += len(data)
+            # After a stall, resume the schedule from now instead of sending a burst
+            next_publish = max(next_publish + self.interval, time.monotonic())
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            'publish_fps': self.published / elapsed if elapsed > 0 else 0.0,
+            'kbytes_per_second': self.bytes_sent / 1024 / elapsed if elapsed > 0 else 0.0,
+            'encode_ms': self.encode_seconds / self.published * 1e3 if self.published else 0.0,
+            'skipped': self.skipped,
+        }